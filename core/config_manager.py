@@ -80,3 +80,76 @@ def load_base_dir_from_F(config: dict, config_path: str) -> str:
     if os.path.isfile(f_val):
         return os.path.dirname(f_val)
     return f_val
+
+def load_base_dir_from_O(config: dict, config_path: str) -> str:
+    """
+    '-O' 옵션 값을 절대 경로로 변환하여 반환합니다. (배포 결과물 기준 디렉토리)
+    
+    Args:
+        config (dict): 설정 데이터
+        config_path (str): 설정 파일 경로
+        
+    Returns:
+        str: -O 기준 디렉토리 절대 경로
+    """
+    return resolve_config_path_value(config_path, get_required_config_value(config, "-O"))
+
+def get_project_name(config: dict) -> str:
+    """
+    프로젝트 이름을 결정합니다. "name" 값이 있으면 사용하고, 없으면 -F 경로의 폴더명을 사용합니다.
+
+    Args:
+        config (dict): (프로젝트 단위) 설정 데이터
+
+    Returns:
+        str: 프로젝트 이름
+    """
+    name = config.get("name")
+    if isinstance(name, str) and name.strip():
+        return name.strip()
+
+    f_val = config.get("-F")
+    if not isinstance(f_val, str) or not f_val.strip():
+        return "(unnamed)"
+    # -F 가 typedefinition.xml 등 파일을 가리키면 그 상위 폴더명을 사용
+    norm = os.path.normpath(f_val.strip().replace("\\", os.sep))
+    if os.path.splitext(norm)[1]:
+        norm = os.path.dirname(norm)
+    return os.path.basename(norm) or norm
+
+def load_project_configs(config: dict) -> list[tuple[str, dict]]:
+    """
+    설정 데이터를 프로젝트 단위 설정 목록으로 펼칩니다.
+    - "projects" 키가 없으면 기존처럼 설정 전체를 하나의 프로젝트로 취급합니다.
+    - "projects" 가 있으면 각 항목에 최상위 값(nexacroDeployExecute, -B, -GENERATERULE 등)을
+      기본값으로 상속시키고, 항목에 같은 키가 있으면 항목 값을 우선합니다.
+
+    Args:
+        config (dict): 설정 데이터
+
+    Returns:
+        list[tuple[str, dict]]: (프로젝트 이름, 병합된 설정) 리스트
+    """
+    projects = config.get("projects")
+    if projects is None:
+        return [(get_project_name(config), config)]
+
+    if not isinstance(projects, list) or not projects:
+        print('config.json의 "projects" 값은 비어있지 않은 배열이어야 합니다.')
+        sys.exit(2)
+
+    defaults = {k: v for k, v in config.items() if k != "projects"}
+    out: list[tuple[str, dict]] = []
+    seen_names: set[str] = set()
+    for idx, entry in enumerate(projects):
+        if not isinstance(entry, dict):
+            print(f'config.json의 "projects" {idx}번째 항목이 객체가 아닙니다.')
+            sys.exit(2)
+        merged = {**defaults, **entry}
+        name = get_project_name(merged)
+        if name in seen_names:
+            print(f'config.json의 "projects"에 같은 이름의 프로젝트가 있습니다: {name} ("name" 값으로 구분하세요)')
+            sys.exit(2)
+        seen_names.add(name)
+        out.append((name, merged))
+    return out
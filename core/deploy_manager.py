@@ -1,7 +1,20 @@
+import os
 import sys
+import time
 import subprocess
+from collections import Counter, deque
 from .config_manager import resolve_config_path_value, get_required_config_value
-from .file_utils import move_js_files_from_file_dir
+from .file_utils import HarvestStats, format_size, has_generated_js, move_js_files_from_file_dir, remove_deployed_js_files
+from .history_store import DeployHistory
+from .governor import ConcurrencyGovernor
+from .scheduler import DeployJob, order_jobs_lpt, estimate_makespan, format_duration
+from .shadow_deploy import ShadowRecord, prepare_shadow_dirs, redirect_jobs_to_shadow, to_shadow_path, finish_shadow_dirs
+
+# 실행 중인 프로세스 종료 여부를 확인하는 주기(초)
+POLL_INTERVAL = 0.2
+
+# 묶음 실행 시 명령줄 최대 길이 (Windows CreateProcess 제한 32767자에 여유를 둔 값)
+MAX_COMMAND_LENGTH = 30000
 
 def build_deploy_base_command(config: dict, config_path: str) -> tuple[list[str], str]:
     """
@@ -32,52 +45,470 @@ def build_deploy_base_command(config: dict, config_path: str) -> tuple[list[str]
         # "-GENERATERULE", <여기서 넣지 않음: 룰 값만 별도로 리턴하여 나중에 결합>
     ], rule_val)
 
-def run_nexacro_deploy_repeat(
-    config: dict,
-    config_path: str,
+def get_batch_file_arg_style(config: dict) -> str:
+    """
+    묶음 실행 시 여러 -FILE 을 넘기는 방식을 설정에서 읽습니다. ("batchFileArgs")
+    - "repeat" (기본값): -FILE a -FILE b ...
+    - "comma": -FILE a,b,...
+    """
+    style = config.get("batchFileArgs", "repeat")
+    if style not in ("repeat", "comma"):
+        print(f'config.json의 "batchFileArgs" 값이 올바르지 않습니다: {style} ("repeat" 또는 "comma")')
+        sys.exit(2)
+    return style
+
+def format_command(cmd: list[str]) -> str:
+    """로그 출력용으로 공백이 포함된 인자를 따옴표로 감싸 한 줄 명령어로 만듭니다."""
+    return " ".join(f'"{c}"' if " " in c else c for c in cmd)
+
+def build_deploy_jobs(
+    base_cmd: list[str],
+    rule_val: str,
     effective_o_map: dict[str, str],
     file_paths_by_rel: dict[str, list[str]],
-) -> None:
+    project: str = "",
+) -> list[DeployJob]:
     """
-    수집된 경로들을 기반으로 Nexacro 배포 명령을 반복 실행합니다.
-    실행 정책:
-      - 기본 옵션은 고정
-      - -O 옵션은 상대 경로 기준으로 매칭하여 변경
-      - 각 -O 마다 동일한 상대 경로에 해당하는 파일(-FILE)에 대해 배포 명령 수행
-    
+    상대 경로별 -O 폴더와 소스 파일 목록을 결합하여 실행할 작업 목록을 만듭니다.
+    반환 순서는 기존 실행 순서(-O 순회 -> 파일 경로 정렬순)와 같습니다.
+
     Args:
-        config (dict): 설정 데이터
-        config_path (str): 설정 파일 경로
+        base_cmd (list[str]): build_deploy_base_command 로 만든 기본 명령어
+        rule_val (str): -GENERATERULE 값
         effective_o_map (dict[str, str]): 상대 경로 -> 배포 대상 출력 폴더 매핑
         file_paths_by_rel (dict[str, list[str]]): 상대 경로 -> 배포 대상 소스 파일 리스트
+        project (str): 작업에 표시할 프로젝트 이름
+
+    Returns:
+        list[DeployJob]: 배포 작업 리스트
     """
-    base_cmd, rule_val = build_deploy_base_command(config, config_path)
+    jobs: list[DeployJob] = []
+    # 동일한 상대 경로끼리만 조합
+    for rel_path, eff_o in effective_o_map.items():
+        for fp in file_paths_by_rel.get(rel_path, []):
+            # 명령어 조합: 기본명령어 + -O <경로> + -GENERATERULE <룰> + -FILE <파일>
+            cmd = base_cmd + ["-O", eff_o, "-GENERATERULE", rule_val, "-FILE", fp]
+            jobs.append(DeployJob(file_path=fp, o_dir=eff_o, rel_path=rel_path, cmd=cmd, project=project))
+    return jobs
 
-    if not effective_o_map:
-        print("실행할 -O 대상이 없습니다. (Services에서 상대경로 토큰을 찾지 못함)")
-        sys.exit(1)
+def coalesce_deploy_jobs(
+    jobs: list[DeployJob],
+    max_batch: int,
+    file_arg_styles: dict[str, str] | None = None,
+) -> list[DeployJob]:
+    """
+    같은 명령(-P/-B/-O/-GENERATERULE 등)으로 실행되는 작업들을 묶어 한 번의 nexacrodeploy 실행으로 합칩니다.
+    프로세스 기동과 nexacrolib 로딩 비용을 파일마다 반복하지 않기 위함입니다.
+    - 프로젝트별 file_arg_styles "repeat": -FILE a -FILE b ... / "comma": -FILE a,b,...
+    - 묶음 크기는 max_batch 개, 명령줄 길이는 MAX_COMMAND_LENGTH 이하로 제한합니다.
+    - 입력 순서(LPT 등)는 각 묶음의 첫 작업 위치 기준으로 유지합니다.
 
-    if not file_paths_by_rel:
-        print("실행할 -FILE 대상 파일이 없습니다. (-F 기준 폴더에서 .xfdl/.xjs 파일을 찾지 못함)")
-        sys.exit(1)
+    Args:
+        jobs (list[DeployJob]): 개별 작업 리스트 (-FILE 이 명령 마지막 인자)
+        max_batch (int): 한 번에 묶을 최대 파일 수 (1 이하이면 묶지 않음)
+        file_arg_styles (dict[str, str] | None): 프로젝트 이름 -> 여러 파일을 넘기는 방식 (없으면 "repeat")
 
-    # 동일한 상대 경로끼리만 조합하여 실행
-    for rel_path, eff_o in effective_o_map.items():
-        files = file_paths_by_rel.get(rel_path, [])
-        if not files:
+    Returns:
+        list[DeployJob]: 묶음 작업 리스트 (파일이 1개인 묶음은 원래 작업 그대로)
+    """
+    if max_batch <= 1:
+        return list(jobs)
+
+    file_arg_styles = file_arg_styles or {}
+
+    # -FILE <파일> 을 제외한 명령이 같은 작업끼리 그룹화
+    groups: dict[tuple[str, ...], list[DeployJob]] = {}
+    for job in jobs:
+        groups.setdefault(tuple(job.cmd[:-2]), []).append(job)
+
+    def flush(prefix: tuple[str, ...], chunk: list[DeployJob], out: list[DeployJob]) -> None:
+        if len(chunk) == 1:
+            out.append(chunk[0])
+            return
+        files = [j.file_path for j in chunk]
+        if file_arg_styles.get(chunk[0].project, "repeat") == "comma":
+            file_args = ["-FILE", ",".join(files)]
+        else:
+            file_args = [arg for fp in files for arg in ("-FILE", fp)]
+        head = chunk[0]
+        out.append(DeployJob(
+            file_path=head.file_path,
+            o_dir=head.o_dir,
+            rel_path=head.rel_path,
+            cmd=list(prefix) + file_args,
+            estimate=sum(j.estimate for j in chunk),
+            project=head.project,
+            batch=list(chunk),
+        ))
+
+    out: list[DeployJob] = []
+    for prefix, members in groups.items():
+        chunk: list[DeployJob] = []
+        length = len(format_command(list(prefix)))
+        for job in members:
+            arg_len = len(job.file_path) + 10  # -FILE, 공백, 따옴표 여유분
+            if chunk and (len(chunk) >= max_batch or length + arg_len > MAX_COMMAND_LENGTH):
+                flush(prefix, chunk, out)
+                chunk, length = [], len(format_command(list(prefix)))
+            chunk.append(job)
+            length += arg_len
+        if chunk:
+            flush(prefix, chunk, out)
+
+    # 원래 순서 유지 (각 묶음의 첫 작업 위치 기준)
+    order = {id(j): i for i, j in enumerate(jobs)}
+    return sorted(out, key=lambda j: order[id(j.members[0])])
+
+def execute_deploy_jobs(
+    jobs: list[DeployJob],
+    max_workers: int = 1,
+    history: DeployHistory | None = None,
+    governor: ConcurrencyGovernor | None = None,
+    harvest: HarvestStats | None = None,
+) -> int:
+    """
+    배포 작업을 주어진 순서대로 최대 max_workers 개까지 동시에 실행합니다.
+    governor 가 주어지면 동시 실행 수는 governor 가 시스템 부하에 따라 결정합니다.
+    - 실패한 작업이 있으면 새 작업은 시작하지 않고, 실행 중인 작업만 마무리합니다.
+    - 묶음 실행이 실패하면 실패로 보지 않고, 묶인 파일들을 개별 실행으로 다시 큐의 앞에 넣습니다.
+      묶음 실행이 성공해도 결과물(.js)이 생성되지 않은 파일은 같은 방식으로 개별 실행합니다.
+      개별 재실행 중인 파일은 그중 하나가 실패해도 모두 실행합니다. (파일 하나 때문에 묶음 전체가 실패하지 않도록)
+    - 같은 소스 폴더/-O 폴더를 쓰는 작업이 모두 끝난 뒤에 .js 파일을 한 번에 이동합니다.
+      (병렬 실행 중 다른 작업이 아직 쓰고 있는 .js 를 옮기지 않기 위함)
+      여러 프로젝트가 같은 소스 폴더(예: ../Base/)를 다른 -O 로 쓰는 경우, .js 가 섞이지 않도록
+      한 -O 의 작업이 모두 끝나 이동할 때까지 다른 -O 의 작업은 그 폴더에서 시작하지 않습니다.
+      실패로 중단된 경우에도 성공한 작업이 있는 폴더는 모든 실행이 끝난 뒤 이동합니다.
+    - 작업이 끝날 때마다 실제 소요 시간을 이력에 기록하고 남은 예상 시간을 출력합니다.
+      (묶음 실행 시간은 파일별 시간이 아니므로 이력에 기록하지 않음)
+
+    Args:
+        jobs (list[DeployJob]): 실행 순서대로 정렬된 작업 리스트
+        max_workers (int): 최대 동시 실행 수
+        history (DeployHistory | None): 소요 시간을 기록할 이력 저장소
+        governor (ConcurrencyGovernor | None): 동시 실행 수 자동 조정기
+        harvest (HarvestStats | None): .js 이동 결과를 누적할 통계
+
+    Returns:
+        int: 종료 코드 (0: 전체 성공, 그 외: 처음 실패한 작업의 종료 코드)
+    """
+    max_workers = max(1, max_workers)
+    pending = deque(jobs)
+    remaining_by_dir = Counter((os.path.dirname(m.file_path), m.o_dir) for j in jobs for m in j.members)
+    succeeded_dirs: dict[tuple[str, str], str] = {}  # 성공한 작업이 있는 폴더 -> 그 폴더의 소스 파일
+    retrying: set[int] = set()  # 묶음 실패로 개별 재실행하는 작업 (id)
+    dir_owner: dict[str, str] = {}  # 소스 폴더 -> 지금 그 폴더에 .js 를 생성 중인 -O (이동이 끝나면 해제)
+    running: dict[subprocess.Popen, tuple[DeployJob, float]] = {}
+
+    total = sum(len(j.members) for j in jobs)  # 진행률은 파일 수 기준
+    done = 0
+    estimated_done = 0.0  # 완료된 작업들의 예상 시간 합
+    actual_done = 0.0     # 완료된 작업들의 실제 시간 합
+    failed_code = 0
+    if governor is not None:
+        governor.start()
+
+    def can_start(job: DeployJob) -> bool:
+        if failed_code and id(job) not in retrying:
+            return False
+        return all(dir_owner.get(os.path.dirname(m.file_path), m.o_dir) == m.o_dir for m in job.members)
+
+    while pending or running:
+        if governor is not None:
+            # 줄어든 경우 실행 중인 작업은 그대로 두고 새 작업만 덜 시작함
+            max_workers = governor.current_workers()
+
+        # 빈 슬롯만큼 작업 시작 (실패 후에는 묶음 실패로 개별 재실행 중인 파일만 계속 실행)
+        # 소스 폴더를 다른 -O 가 쓰고 있는 작업은 건너뛰고, 큐에서 시작할 수 있는 첫 작업을 실행
+        while pending and len(running) < max_workers:
+            index = next((i for i, j in enumerate(pending) if can_start(j)), None)
+            if index is None:
+                break
+            job = pending[index]
+            del pending[index]
+            for member in job.members:
+                dir_owner.setdefault(os.path.dirname(member.file_path), member.o_dir)
+            print("\n[RUN]", format_command(job.cmd))
+            running[subprocess.Popen(job.cmd)] = (job, time.monotonic())
+
+        if not running:
+            break
+
+        # 가장 먼저 시작한 프로세스를 기준으로 잠시 대기 (단일 실행이면 즉시 반환)
+        try:
+            next(iter(running)).wait(timeout=POLL_INTERVAL)
+        except subprocess.TimeoutExpired:
+            pass
+
+        for proc in [p for p in running if p.poll() is not None]:
+            job, started = running.pop(proc)
+            elapsed = time.monotonic() - started
+            job.returncode = proc.returncode
+            job.duration = elapsed
+
+            if proc.returncode != 0 and job.batch:
+                # 묶음 실패: 어떤 파일이 문제인지 알 수 없으므로 파일별로 다시 실행
+                print(f"묶음 실행에 실패했습니다. 종료 코드: {proc.returncode} - 파일 {len(job.batch)}개를 개별 실행합니다.")
+                job.retried = list(job.batch)
+                pending.extendleft(reversed(job.retried))
+                retrying.update(id(m) for m in job.retried)
+                continue
+
+            members = job.members
+            if proc.returncode == 0 and job.batch:
+                # 여러 -FILE 중 일부만 처리하고 정상 종료하는 경우가 있으므로 파일별 결과물(.js) 생성 여부 확인
+                started_at = time.time() - elapsed
+                job.retried = [m for m in job.batch if not has_generated_js(m.file_path, started_at)]
+                if job.retried:
+                    print(f"묶음 실행 후 결과물(.js)이 없는 파일 {len(job.retried)}개를 개별 실행합니다.")
+                    pending.extendleft(reversed(job.retried))
+                    retrying.update(id(m) for m in job.retried)
+                    missing = {id(m) for m in job.retried}
+                    members = [m for m in job.batch if id(m) not in missing]
+
+            if proc.returncode != 0:
+                print("nexacroDeployExecute 실행에 실패했습니다. 종료 코드:", proc.returncode, "-", job.file_path)
+                if not failed_code:
+                    failed_code = proc.returncode
+                continue
+
+            if history is not None and not job.batch:
+                history.record(job.file_path, elapsed)
+            if not members:
+                continue
+            if governor is not None:
+                governor.job_completed(len(members))
+
+            done += len(members)
+            estimated_done += sum(m.estimate for m in members)
+            actual_done += elapsed
+
+            if job.batch:
+                # 묶음 실행 시간은 예상 시간 비율로 나누어 각 파일에 기록 (프로젝트별 요약용)
+                batch_estimate = sum(m.estimate for m in members)
+                for member in members:
+                    member.returncode = 0
+                    member.duration = elapsed * (member.estimate / batch_estimate if batch_estimate > 0 else 1 / len(members))
+
+            # 같은 폴더의 작업이 모두 끝났으면 생성된 JS 파일 이동 처리
+            for member in members:
+                key = (os.path.dirname(member.file_path), member.o_dir)
+                succeeded_dirs[key] = member.file_path
+                remaining_by_dir[key] -= 1
+                if remaining_by_dir[key] == 0:
+                    moved = move_js_files_from_file_dir(member.file_path, member.o_dir)
+                    if harvest is not None:
+                        harvest.add(moved)
+                    dir_owner.pop(key[0], None)
+
+            if not failed_code:
+                # 지금까지의 (실제/예상) 비율로 남은 작업의 예상 시간을 보정
+                factor = actual_done / estimated_done if estimated_done > 0 else 1.0
+                now = time.monotonic()
+                remaining = [max(j.estimate * factor - (now - s), 0.0) for j, s in running.values()]
+                remaining += [j.estimate * factor for j in pending]
+                eta = estimate_makespan(remaining, max_workers)
+                print(f"[{done}/{total}] 완료 ({format_duration(elapsed)}) - 남은 예상 시간: {format_duration(eta)}")
+
+    if failed_code:
+        # 실패로 남은 작업이 실행되지 않은 폴더도, 이미 성공한 파일의 결과물은 -O 폴더로 이동
+        # 실패한 파일의 결과물(.js)은 불완전할 수 있으므로 삭제하고, 실행되지 않은 파일의 .js 는 옮기지 않음
+        unfinished: dict[tuple[str, str], set[str]] = {}
+        for member in (m for j in jobs for m in j.members):
+            if member.returncode == 0:
+                continue
+            key = (os.path.dirname(member.file_path), member.o_dir)
+            js_path = member.file_path + ".js"
+            unfinished.setdefault(key, set()).add(os.path.basename(js_path))
+            if member.returncode is not None and key in succeeded_dirs and os.path.isfile(js_path):
+                os.remove(js_path)
+        for key, file_path in succeeded_dirs.items():
+            if remaining_by_dir[key] > 0:
+                moved = move_js_files_from_file_dir(file_path, key[1], unfinished.get(key))
+                if harvest is not None:
+                    harvest.add(moved)
+
+    return failed_code
+
+def print_project_summary(jobs: list[DeployJob]) -> None:
+    """프로젝트별 작업 수, 성공/실패/미실행 수, 누적 실행 시간을 출력합니다."""
+    stats: dict[str, list] = {}  # 프로젝트 -> [전체, 성공, 실패, 누적 시간]
+    for job in jobs:
+        st = stats.setdefault(job.project, [0, 0, 0, 0.0])
+        st[0] += 1
+        if job.returncode == 0:
+            st[1] += 1
+        elif job.returncode is not None:
+            st[2] += 1
+        st[3] += job.duration
+
+    print("[SUMMARY] 프로젝트별 결과")
+    for name, (total, ok, failed, busy) in stats.items():
+        skipped = total - ok - failed
+        print(f"  {name}: 전체 {total}, 성공 {ok}, 실패 {failed}, 미실행 {skipped}, 누적 실행 시간 {format_duration(busy)}")
+
+def print_batch_summary(
+    deploy_jobs: list[DeployJob],
+    exec_jobs: list[DeployJob],
+    history: DeployHistory | None = None,
+    exit_code: int = 0,
+) -> None:
+    """
+    묶음 실행 결과를 출력합니다. 성공한 파일이 모두 단독 실행 이력(실측값)을 가지고 있을 때만
+    파일별 실행 시간 합계와 실제 누적 실행 시간을 비교하여 속도 향상을 보여줍니다.
+    (크기 기반 추정값이나 기본값과는 비교하지 않으며, 실패한 실행도 비교하지 않음)
+    """
+    retried = [m for j in exec_jobs for m in j.retried if m.returncode is not None]
+    invocations = sum(1 for j in exec_jobs if j.returncode is not None) + len(retried)
+
+    line = f"[SUMMARY] 묶음 실행: 파일 {len(deploy_jobs)}개를 {invocations}회 실행으로 처리"
+    if retried:
+        line += f" (묶음 실패/결과물 누락으로 개별 재실행 {len(retried)}개)"
+    print(line)
+    if exit_code != 0 or history is None:
+        return
+
+    measured = [history.measured(j.file_path) for j in deploy_jobs]
+    if any(m is None for m in measured):
+        print("[SUMMARY] 단독 실행 이력이 없는 파일이 있어 속도 비교를 생략합니다.")
+        return
+
+    # 실행한 프로세스(묶음 + 개별 재실행)의 실제 소요 시간 합계
+    busy = sum(j.duration for j in exec_jobs if j.returncode is not None) + sum(m.duration for m in retried)
+    baseline = sum(measured)
+    if busy > 0 and baseline > 0:
+        print(
+            f"[SUMMARY] 누적 실행 시간 {format_duration(busy)} "
+            f"(파일별 단독 실행 이력 합계 {format_duration(baseline)}, 약 {baseline / busy:.1f}배)"
+        )
+
+def clean_removed_outputs(
+    removed_dirs: dict[str, dict[str, str]],
+    deploy_jobs: list[DeployJob],
+    shadows: dict[str, str],
+) -> None:
+    """
+    Services 에서 삭제된 경로의 배포 결과(.js)를 정리합니다.
+    배포 작업이 모두 성공한 프로젝트만 정리하며, 그림자 폴더를 쓰는 경우 그림자 폴더 안에서 정리하여
+    서비스 중인 -O 폴더는 폴더 교체 시 한 번에 바뀌도록 합니다.
+
+    Args:
+        removed_dirs (dict[str, dict[str, str]]): 프로젝트 이름 -> (삭제된 상대 경로 -> -O 폴더)
+        deploy_jobs (list[DeployJob]): 실행한 (개별) 작업 리스트
+        shadows (dict[str, str]): 최상위 -O 폴더 -> 그림자 폴더 (그림자 폴더를 쓰지 않으면 빈 dict)
+    """
+    failed_projects = {j.project for j in deploy_jobs if j.returncode != 0}
+    for name, dirs in removed_dirs.items():
+        if name in failed_projects:
+            print(f"[{name}] 배포 실패로 삭제된 경로를 정리하지 않습니다.")
             continue
-        for fp in files:
-            # 명령어 조합: 기본명령어 + -O <경로> + -GENERATERULE <룰> + -FILE <파일>
-            cmd = base_cmd + ["-O", eff_o, "-GENERATERULE", rule_val, "-FILE", fp]
-            
-            # 실행 로그 출력
-            print("\n[RUN]", " ".join(f'"{c}"' if " " in c else c for c in cmd))
-            
-            # 프로세스 실행
-            result = subprocess.run(cmd, check=False)
-            if result.returncode != 0:
-                print("nexacroDeployExecute 실행에 실패했습니다. 종료 코드:", result.returncode)
-                sys.exit(result.returncode)
-            
-            # 생성된 JS 파일 이동 처리
-            move_js_files_from_file_dir(fp, eff_o)
+        for rel_path, o_dir in dirs.items():
+            removed = remove_deployed_js_files(to_shadow_path(o_dir, shadows))
+            print(f"[{name}] 삭제된 경로 정리: {rel_path} -> {o_dir} (.js {removed}개 삭제)")
+
+def run_deploy_jobs(
+    deploy_jobs: list[DeployJob],
+    jobs: int = 1,
+    history: DeployHistory | None = None,
+    governor: ConcurrencyGovernor | None = None,
+    batch_size: int = 0,
+    file_arg_styles: dict[str, str] | None = None,
+    shadow: ShadowRecord | None = None,
+    removed_dirs: dict[str, dict[str, str]] | None = None,
+    unswapped_projects: set[str] | None = None,
+) -> int:
+    """
+    배포 작업 목록을 하나의 실행 큐로 실행하고 요약을 출력합니다. (단일/여러 프로젝트 공통)
+    여러 프로젝트의 작업이 섞여 있어도 동시 실행 수 제한은 전체에 한 번만 적용됩니다.
+    병렬 실행(jobs > 1 또는 자동 조정) 시에는 이력 기반 예상 시간이 긴 파일부터 실행합니다. (LPT)
+    batch_size 가 2 이상이면 같은 -O 폴더의 파일들을 묶어 nexacrodeploy 실행 횟수를 줄입니다.
+    shadow 가 주어지면 -O 폴더 옆의 그림자 폴더에 배포한 뒤, 성공한 경우에만 폴더째 교체하고 교체한 폴더를 기록합니다.
+    removed_dirs 가 주어지면 배포가 성공한 프로젝트의 삭제된 경로 결과물을 배포 후(교체 전)에 정리합니다.
+
+    Args:
+        deploy_jobs (list[DeployJob]): 실행할 작업 리스트
+        jobs (int): 최대 동시 실행 수 (1이면 기존과 동일하게 순차 실행)
+        history (DeployHistory | None): 파일별 소요 시간 이력 (예상 시간 계산 및 기록용)
+        governor (ConcurrencyGovernor | None): 지정 시 jobs 대신 시스템 부하에 따라 동시 실행 수를 조정
+        batch_size (int): 한 번에 묶을 최대 파일 수 (0 또는 1이면 파일마다 실행)
+        file_arg_styles (dict[str, str] | None): 프로젝트 이름 -> 묶음 실행 시 -FILE 전달 방식
+        shadow (ShadowRecord | None): 지정 시 그림자 폴더에 배포 후 교체하고, 교체한 폴더를 기록 (--rollback 대상)
+        removed_dirs (dict[str, dict[str, str]] | None): 프로젝트 이름 -> (Services 에서 삭제된 상대 경로 -> -O 폴더)
+        unswapped_projects (set[str] | None): 작업은 성공했지만 폴더 교체에 실패한 프로젝트 이름을 채워 받을 집합
+
+    Returns:
+        int: 종료 코드 (0: 전체 성공, 그림자 폴더 준비 또는 폴더 교체 실패 시 1)
+    """
+    if history is not None:
+        for job in deploy_jobs:
+            job.estimate = history.estimate(job.file_path)
+
+    # 병렬 실행일 때만 LPT 순서로 재정렬 (순차 실행은 경로순 유지)
+    parallel = jobs > 1 or governor is not None
+    if parallel:
+        deploy_jobs = order_jobs_lpt(deploy_jobs)
+
+    # 서비스 중인 -O 폴더 대신 그림자 폴더에 배포 (묶음 명령을 만들기 전에 -O 를 바꿔야 함)
+    shadows: dict[str, str] = {}
+    if shadow is not None:
+        # 삭제된 경로를 정리할 폴더도 같은 교체 단위에 포함
+        clean_o_dirs = {o for dirs in (removed_dirs or {}).values() for o in dirs.values()}
+        try:
+            shadows = prepare_shadow_dirs({j.o_dir for j in deploy_jobs} | clean_o_dirs)
+        except OSError as exc:
+            # 작업을 하나도 실행하지 않았으므로 서비스 중인 -O 폴더는 그대로
+            print("[SHADOW] 그림자 폴더를 준비하지 못해 배포를 중단합니다:", exc)
+            if unswapped_projects is not None:
+                unswapped_projects.update(j.project for j in deploy_jobs)
+                unswapped_projects.update(removed_dirs or {})
+            return 1
+        redirect_jobs_to_shadow(deploy_jobs, shadows)
+
+    exec_jobs = coalesce_deploy_jobs(deploy_jobs, batch_size, file_arg_styles)
+    if parallel and len(exec_jobs) != len(deploy_jobs):
+        exec_jobs = order_jobs_lpt(exec_jobs)
+
+    if governor is not None:
+        jobs = governor.workers
+    eta = estimate_makespan([j.estimate for j in exec_jobs], jobs)
+    if history is not None and deploy_jobs:
+        mode = f"자동 조정 {governor.min_workers}~{governor.max_workers}개" if governor is not None else f"{jobs}개"
+        print(f"배포 대상 {len(deploy_jobs)}개, 동시 실행 {mode} - 예상 소요 시간: {format_duration(eta)}")
+
+    harvest = HarvestStats()
+    started = time.monotonic()
+    exit_code = execute_deploy_jobs(exec_jobs, jobs, history, governor, harvest)
+    elapsed = time.monotonic() - started
+
+    if removed_dirs:
+        clean_removed_outputs(removed_dirs, deploy_jobs, shadows)
+    if shadows:
+        swapped, swap_failed = finish_shadow_dirs(shadows, deploy_jobs, removed_dirs)
+        shadow.replace(swapped)
+        shadow.save()
+        if swap_failed:
+            if unswapped_projects is not None:
+                unswapped_projects.update(swap_failed)
+            exit_code = exit_code or 1
+
+    if len(exec_jobs) != len(deploy_jobs):
+        print_batch_summary(deploy_jobs, exec_jobs, history, exit_code)
+
+    if not deploy_jobs:
+        # 삭제된 경로 정리만 수행한 경우
+        return exit_code
+
+    print(
+        f"[SUMMARY] JS 반영: 교체 {harvest.written}개 ({format_size(harvest.written_bytes)}), "
+        f"동일하여 건너뜀 {harvest.skipped}개 ({format_size(harvest.skipped_bytes)})"
+    )
+
+    if history is not None:
+        print(f"[SUMMARY] 실제 소요 시간: {format_duration(elapsed)} (예상: {format_duration(eta)})")
+    if governor is not None:
+        print(f"[SUMMARY] 동시 실행 수 조정 내역 (최종 {governor.workers}개)")
+        for line in governor.format_summary():
+            print("  " + line)
+    if len({j.project for j in deploy_jobs}) > 1:
+        print_project_summary(deploy_jobs)
+
+    return exit_code
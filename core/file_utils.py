@@ -1,69 +1,34 @@
 import os
 import sys
 import shutil
-from .config_manager import resolve_config_path_value, get_required_config_value, load_base_dir_from_F
+import errno
+import filecmp
+from dataclasses import dataclass
+from .services_registry import ServiceEntry
 
-def compute_effective_O_values(config: dict, config_path: str, rel_paths: list[str]) -> dict[str, str]:
+def collect_source_files(entries: list[ServiceEntry]) -> dict[str, list[str]]:
     """
-    설정 파일의 -O 옵션 값과 Services에서 추출한 상대 경로들을 결합하여,
-    실제로 배포 결과물이 저장될 절대 경로를 상대 경로 기준으로 매핑합니다..
+    레지스트리 항목의 -F 기준 경로에서 실제 파일(.xfdl, .xjs) 목록을 수집합니다.
     
     Args:
-        config (dict): 설정 데이터
-        config_path (str): 설정 파일 경로
-        rel_paths (list[str]): xml_parser에서 추출한 상대 경로 리스트
+        entries (list[ServiceEntry]): 수집할 Services 항목 리스트
         
     Returns:
-        dict[str, str]: 상대 경로 -> 결합된 절대 경로(-O) 매핑
+        dict[str, list[str]]: 정규화된 상대 경로 -> 배포 대상 파일 절대 경로 리스트(정렬)
     """
-    # 기본 -O 값 가져오기 (절대 경로 변환)
-    base_o = resolve_config_path_value(config_path, get_required_config_value(config, "-O"))
-    o_values: dict[str, str] = {}
-
-    for rp in rel_paths:
-        norm_rp = os.path.normpath(rp)
-        # base_o 경로와 상대 경로(rp)를 결합
-        eff = os.path.normpath(os.path.join(base_o, rp))
-        if norm_rp not in o_values:
-            o_values[norm_rp] = eff
-    return o_values
-
-def collect_files_for_FILE_from_F(config: dict, config_path: str, rel_paths: list[str]) -> dict[str, list[str]]:
-    """
-    -F 기준 경로와 Services의 상대 경로를 결합하여 실제 파일(.xfdl, .xjs) 목록을 수집합니다.
-    
-    Args:
-        config (dict): 설정 데이터
-        config_path (str): 설정 파일 경로
-        rel_paths (list[str]): xml_parser에서 추출한 상대 경로 리스트
-        
-    Returns:
-        list[str]: 배포 대상 파일들의 절대 경로 리스트
-    """
-    # -F 옵션으로 기준 디렉토리 로드
-    base_f_dir = load_base_dir_from_F(config, config_path)
-
     allowed_extensions = {".xfdl", ".xjs"}
 
     def is_allowed_file(path: str) -> bool:
         return os.path.splitext(path)[1].lower() in allowed_extensions
 
     out_files: dict[str, list[str]] = {}
-    seen_targets = set()  # 중복 경로 체크용
-
-    for rp in rel_paths:
-        norm_rp = os.path.normpath(rp)
-        # 기준 디렉토리와 상대 경로 결합하여 탐색 대상 경로 생성
-        target = os.path.normpath(os.path.join(base_f_dir, rp))
-
-        if target in seen_targets:
-            continue
-        seen_targets.add(target)
 
+    for entry in entries:
+        target = entry.source_path
         if not os.path.exists(target):
             print("경로가 존재하지 않습니다:", target)
             continue
-        
+
         collected: set[str] = set()
 
         # 대상이 파일인 경우 바로 추가
@@ -78,24 +43,105 @@ def collect_files_for_FILE_from_F(config: dict, config_path: str, rel_paths: lis
                     collected.add(full)
 
         if collected:
-            out_files.setdefault(norm_rp, [])
-            out_files[norm_rp].extend(sorted(collected))
+            out_files[entry.rel_path] = sorted(collected)
+
+    return out_files
+
+@dataclass
+class HarvestStats:
+    """생성된 .js 를 -O 폴더로 옮긴 결과 (실행 요약 출력용)"""
+    written: int = 0        # 새로 쓰거나 내용이 바뀌어 교체한 파일 수
+    skipped: int = 0        # 기존 파일과 내용이 같아 건드리지 않은 파일 수
+    written_bytes: int = 0
+    skipped_bytes: int = 0
+
+    def add(self, other: "HarvestStats") -> None:
+        self.written += other.written
+        self.skipped += other.skipped
+        self.written_bytes += other.written_bytes
+        self.skipped_bytes += other.skipped_bytes
+
+def format_size(num_bytes: int) -> str:
+    """바이트 수를 사람이 읽기 쉬운 단위(B, KB, MB, GB)로 변환합니다."""
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+def is_same_file_content(src_path: str, dest_path: str) -> bool:
+    """
+    두 파일의 내용이 같은지 확인합니다. 크기가 다르면 내용을 읽지 않고 바로 False 를 반환합니다.
+    
+    Args:
+        src_path (str): 새로 생성된 파일
+        dest_path (str): 이미 배포되어 있는 파일
+        
+    Returns:
+        bool: 내용이 바이트 단위로 같으면 True
+    """
+    try:
+        if os.path.getsize(src_path) != os.path.getsize(dest_path):
+            return False
+    except OSError:
+        return False
+    return filecmp.cmp(src_path, dest_path, shallow=False)
+
+def replace_file_atomic(src_path: str, dest_path: str) -> None:
+    """
+    src_path 를 dest_path 로 원자적으로 교체합니다. (읽는 쪽에서 반쯤 쓰인 파일이 보이지 않음)
+    같은 드라이브면 이름 변경으로, 다른 드라이브면 대상 폴더에 임시 파일로 복사한 뒤 교체합니다.
+    """
+    try:
+        os.replace(src_path, dest_path)
+        return
+    except OSError as exc:
+        # 드라이브가 달라 이름 변경이 불가능한 경우만 복사 방식으로 처리
+        if exc.errno != errno.EXDEV:
+            raise
+
+    tmp_path = dest_path + ".tmp"
+    shutil.copy2(src_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+    os.remove(src_path)
 
-    # 중복 제거 및 정렬하여 반환
-    return {rp: sorted(set(files)) for rp, files in out_files.items()}
+def has_generated_js(file_path: str, since: float) -> bool:
+    """
+    소스 파일의 배포 결과물(<파일명>.js, 예: Form.xfdl.js)이 since 이후에 생성/갱신되었는지 확인합니다.
+    (파일 시스템 시각 해상도를 고려하여 2초 여유를 둠)
+
+    Args:
+        file_path (str): -FILE 로 넘긴 소스 파일 경로
+        since (float): 실행 시작 시각 (time.time() 기준)
+
+    Returns:
+        bool: 결과물이 있으면 True
+    """
+    try:
+        return os.path.getmtime(file_path + ".js") >= since - 2.0
+    except OSError:
+        return False
 
-def move_js_files_from_file_dir(file_path: str, o_dir: str) -> None:
+def move_js_files_from_file_dir(file_path: str, o_dir: str, exclude: set[str] | None = None) -> HarvestStats:
     """
     배포 실행 후 생성된 .js 파일들을 원본 폴더에서 대상 폴더(-O 경로)로 이동시킵니다.
+    대상에 내용이 같은 파일이 이미 있으면 대상은 그대로 두고(수정 시각 유지) 원본만 삭제합니다.
+    (불필요한 디스크 쓰기와 Tomcat 리소스 리로드/브라우저 캐시 무효화를 막기 위함)
     
     Args:
         file_path (str): 원본 파일 경로 (-FILE 인자로 사용된 값)
         o_dir (str): 이동할 대상 디렉토리 경로 (-O 값)
+        exclude (set[str] | None): 이동하지 않을 .js 파일명 (예: 실패한 작업의 결과물)
+        
+    Returns:
+        HarvestStats: 교체/건너뛴 파일 수와 크기
     """
+    stats = HarvestStats()
     src_dir = os.path.dirname(file_path) # 원본 파일이 있는 디렉토리
     if not os.path.isdir(src_dir):
         print("원본 폴더가 존재하지 않습니다:", src_dir)
-        return
+        return stats
 
     # 대상 디렉토리가 없으면 생성
     os.makedirs(o_dir, exist_ok=True)
@@ -104,6 +150,8 @@ def move_js_files_from_file_dir(file_path: str, o_dir: str) -> None:
         # .js 확장자만 처리
         if os.path.splitext(name)[1].lower() != ".js":
             continue
+        if exclude and name in exclude:
+            continue
 
         src_path = os.path.join(src_dir, name)
         if not os.path.isfile(src_path):
@@ -119,10 +167,44 @@ def move_js_files_from_file_dir(file_path: str, o_dir: str) -> None:
         dest_dir = os.path.dirname(dest_path)
         if dest_dir:
             os.makedirs(dest_dir, exist_ok=True)
-            
-        # 이미 대상 파일이 존재하면 삭제 (덮어쓰기 준비)
-        if os.path.exists(dest_path):
-            os.remove(dest_path)
 
-        # 파일 이동
-        shutil.move(src_path, dest_path)
+        size = os.path.getsize(src_path)
+
+        # 이미 같은 내용의 파일이 배포되어 있으면 대상은 건드리지 않음
+        if os.path.isfile(dest_path) and is_same_file_content(src_path, dest_path):
+            os.remove(src_path)
+            stats.skipped += 1
+            stats.skipped_bytes += size
+            continue
+
+        # 파일 교체 (기존 파일 삭제 없이 원자적으로)
+        replace_file_atomic(src_path, dest_path)
+        stats.written += 1
+        stats.written_bytes += size
+
+    return stats
+
+def remove_deployed_js_files(o_dir: str) -> int:
+    """
+    더 이상 Services 에 없는 경로의 배포 결과물(.js)을 -O 폴더에서 삭제합니다.
+    .js 이외의 파일은 건드리지 않으며, 삭제 후 폴더가 비면 폴더도 삭제합니다.
+
+    Args:
+        o_dir (str): 정리할 -O 폴더 경로
+
+    Returns:
+        int: 삭제한 파일 수
+    """
+    if not os.path.isdir(o_dir):
+        return 0
+
+    removed = 0
+    for name in os.listdir(o_dir):
+        path = os.path.join(o_dir, name)
+        if os.path.isfile(path) and os.path.splitext(name)[1].lower() == ".js":
+            os.remove(path)
+            removed += 1
+
+    if not os.listdir(o_dir):
+        os.rmdir(o_dir)
+    return removed
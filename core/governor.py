@@ -0,0 +1,315 @@
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+try:
+    import psutil  # 선택 의존성: 설치되어 있으면 CPU/메모리/디스크 측정에 사용
+except ImportError:  # pragma: no cover - 환경에 따라 다름
+    psutil = None
+
+# 이 값을 넘으면 과부하로 보고 동시 실행 수를 줄입니다.
+CPU_HIGH_PERCENT = 90.0
+MEM_LOW_PERCENT = 10.0       # 사용 가능한 메모리 비율(%)
+MEM_CRITICAL_PERCENT = 5.0   # 이보다 낮으면 동시 실행 수를 절반으로 줄임
+DISK_BUSY_HIGH = 2.0         # 평균 디스크 대기열 길이 (가중 I/O 시간 / 측정 간격, 디스크 합계)
+
+# 이 값보다 여유가 있을 때만 동시 실행 수를 늘립니다.
+CPU_LOW_PERCENT = 75.0
+
+# 증설 직후 처리량이 이 비율 이상 떨어지면 증설을 되돌립니다.
+THROUGHPUT_DROP_RATIO = 0.9
+
+
+@dataclass
+class SystemSample:
+    """측정 시점의 시스템 상태 (측정할 수 없는 항목은 None)"""
+    cpu_percent: float | None
+    mem_available_percent: float | None
+    disk_busy: float | None
+
+
+@dataclass
+class GovernorStep:
+    """조정 구간 하나의 기록 (실행 요약 출력용)"""
+    elapsed: float        # 실행 시작 후 경과 시간(초)
+    workers: int          # 이 구간에 사용한 동시 실행 수
+    throughput: float     # 이 구간의 처리량 (완료 작업 수 / 분)
+    sample: SystemSample
+    action: str           # 다음 구간의 조정 방향 ("+": 증가, "-": 감소, "--": 절반, "=": 유지)
+
+
+class _SystemProbe:
+    """psutil 이 있으면 사용하고, 없으면 OS별 기본 방법으로 시스템 상태를 측정합니다."""
+
+    def __init__(self):
+        self._last_cpu: tuple[float, float] | None = None   # (idle, total)
+        self._last_disk: tuple[float, float] | None = None  # (가중 I/O 시간 누적(ms), 측정 시각)
+        self.sample()  # 첫 호출은 기준값만 저장
+
+    def sample(self) -> SystemSample:
+        return SystemSample(self._cpu_percent(), self._mem_available_percent(), self._disk_busy())
+
+    def _cpu_percent(self) -> float | None:
+        if psutil is not None:
+            return psutil.cpu_percent(interval=None)
+
+        times = _read_cpu_times()
+        if times is None:
+            if hasattr(os, "getloadavg"):
+                return min(100.0, os.getloadavg()[0] / (os.cpu_count() or 1) * 100.0)
+            return None
+
+        last, self._last_cpu = self._last_cpu, times
+        if last is None or times[1] <= last[1]:
+            return None
+        idle = times[0] - last[0]
+        total = times[1] - last[1]
+        return max(0.0, min(100.0, (1.0 - idle / total) * 100.0))
+
+    def _mem_available_percent(self) -> float | None:
+        if psutil is not None:
+            return 100.0 - psutil.virtual_memory().percent
+        return _read_mem_available_percent()
+
+    def _disk_busy(self) -> float | None:
+        weighted_ms = _read_disk_io_ms()
+        if weighted_ms is None:
+            return None
+        now = time.monotonic()
+        last, self._last_disk = self._last_disk, (weighted_ms, now)
+        if last is None or now <= last[1]:
+            return None
+        return (weighted_ms - last[0]) / ((now - last[1]) * 1000.0)
+
+
+def _read_cpu_times() -> tuple[float, float] | None:
+    """누적 CPU 시간 (idle, total) 을 반환합니다. (Linux: /proc/stat, Windows: GetSystemTimes)"""
+    if os.path.isfile("/proc/stat"):
+        try:
+            with open("/proc/stat", "r", encoding="ascii") as f:
+                fields = [float(v) for v in f.readline().split()[1:]]
+        except (OSError, ValueError):
+            return None
+        # idle + iowait 를 유휴 시간으로 취급
+        return fields[3] + (fields[4] if len(fields) > 4 else 0.0), sum(fields)
+
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        idle, kernel, user = wintypes.FILETIME(), wintypes.FILETIME(), wintypes.FILETIME()
+        if not ctypes.windll.kernel32.GetSystemTimes(ctypes.byref(idle), ctypes.byref(kernel), ctypes.byref(user)):
+            return None
+
+        def to_int(ft) -> int:
+            return (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+
+        # kernel 시간에는 idle 시간이 포함되어 있음
+        return float(to_int(idle)), float(to_int(kernel) + to_int(user))
+    return None
+
+
+def _read_mem_available_percent() -> float | None:
+    """사용 가능한 물리 메모리 비율(%)을 반환합니다. (Linux: /proc/meminfo, Windows: GlobalMemoryStatusEx)"""
+    if os.path.isfile("/proc/meminfo"):
+        info: dict[str, int] = {}
+        try:
+            with open("/proc/meminfo", "r", encoding="ascii") as f:
+                for line in f:
+                    name, _, rest = line.partition(":")
+                    info[name] = int(rest.split()[0])
+        except (OSError, ValueError, IndexError):
+            return None
+        if info.get("MemTotal") and "MemAvailable" in info:
+            return info["MemAvailable"] / info["MemTotal"] * 100.0
+        return None
+
+    if sys.platform == "win32":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        stat = MEMORYSTATUSEX()
+        stat.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(stat)):
+            return None
+        return 100.0 - float(stat.dwMemoryLoad)
+    return None
+
+
+def _is_whole_disk(name: str) -> bool:
+    """
+    파티션(sda1 등)과 다른 장치 위에 만들어진 가상 장치(dm-*, md* 등)를 제외한 실제 디스크인지 확인합니다.
+    (같은 I/O 가 디스크/파티션/가상 장치에 중복 집계되지 않도록 하기 위함)
+    """
+    if name.startswith(("loop", "ram", "zram")):
+        return False
+    sys_dir = os.path.join("/sys/class/block", name)
+    if not os.path.isdir(sys_dir):
+        return True
+    if os.path.exists(os.path.join(sys_dir, "partition")):
+        return False
+    slaves = os.path.join(sys_dir, "slaves")
+    return not (os.path.isdir(slaves) and os.listdir(slaves))
+
+
+def _read_disk_io_ms() -> float | None:
+    """
+    실제 디스크들의 가중 I/O 시간 누적값(ms)을 반환합니다. (요청 수 x 대기 시간의 합)
+    측정 간격으로 나누면 평균 디스크 대기열 길이가 되며, 측정 방법과 관계없이 같은 의미로 계산합니다.
+    - Linux: /proc/diskstats 의 weighted time spent doing I/Os
+    - 그 외: psutil 의 디스크별 read_time + write_time
+    """
+    if os.path.isfile("/proc/diskstats"):
+        total = 0.0
+        try:
+            with open("/proc/diskstats", "r", encoding="ascii") as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 14 or not _is_whole_disk(fields[2]):
+                        continue
+                    total += float(fields[13])  # weighted time spent doing I/Os (ms)
+        except (OSError, ValueError):
+            return None
+        return total
+
+    if psutil is not None:
+        try:
+            per_disk = psutil.disk_io_counters(perdisk=True)
+        except (RuntimeError, OSError):
+            return None
+        if not per_disk:
+            return None
+        return float(sum(io.read_time + io.write_time for name, io in per_disk.items() if _is_whole_disk(name)))
+    return None
+
+
+class ConcurrencyGovernor:
+    """
+    시스템 부하와 작업 처리량을 주기적으로 측정하여 동시 실행 수를 조정합니다.
+    - 보수적으로 min_workers 에서 시작
+    - CPU/메모리/디스크가 과부하이면 1개 감소 (메모리가 매우 부족하면 절반으로)
+    - 여유가 있으면 1개 증가, 증가 후 처리량이 떨어졌으면 되돌리고 상한을 낮춤
+    """
+
+    def __init__(self, min_workers: int = 1, max_workers: int | None = None, interval: float = 5.0):
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers or os.cpu_count() or 1)
+        self.interval = interval
+        self.workers = self.min_workers
+        self.steps: list[GovernorStep] = []
+
+        self._probe = _SystemProbe()
+        self._started = time.monotonic()
+        self._window_started = self._started
+        self._last_sample = self._started
+        self._window_completed = 0
+        self._last_throughput: float | None = None
+        self._last_action = "="
+        self._ceiling = self.max_workers  # 처리량이 떨어진 지점 기억 (이 이상으로는 늘리지 않음)
+
+    def start(self) -> None:
+        """측정 기준 시각을 지금으로 맞춥니다. (작업 실행 직전에 호출)"""
+        self._started = time.monotonic()
+        self._window_started = self._started
+        self._last_sample = self._started
+        self._window_completed = 0
+        self._probe.sample()
+
+    def job_completed(self, count: int = 1) -> None:
+        """작업(파일) count 개가 끝났음을 알립니다."""
+        self._window_completed += count
+
+    def current_workers(self) -> int:
+        """
+        측정 주기가 지났으면 상태를 측정하여 동시 실행 수를 다시 계산하고, 현재 값을 반환합니다.
+        과부하는 즉시 반영하고, 처리량 비교는 현재 동시 실행 수 이상의 작업이 끝난 구간에서만 합니다.
+
+        Returns:
+            int: 지금 허용되는 동시 실행 수
+        """
+        now = time.monotonic()
+        if now - self._last_sample < self.interval:
+            return self.workers
+        self._last_sample = now
+
+        window = now - self._window_started
+        throughput = self._window_completed / window * 60.0 if window > 0 else 0.0
+        ready = self._window_completed >= self.workers
+        sample = self._probe.sample()
+        action = self._decide(sample, throughput, ready)
+
+        if ready or action != "=":
+            self.steps.append(GovernorStep(now - self._started, self.workers, throughput, sample, action))
+        if action == "+":
+            self.workers += 1
+        elif action == "-":
+            self.workers -= 1
+        elif action == "--":
+            self.workers = max(self.min_workers, self.workers // 2)
+        self.workers = max(self.min_workers, min(self.workers, self.max_workers))
+
+        if ready or action != "=":
+            # 처리량 비교 구간을 새로 시작 (과부하로 줄인 경우 이전 처리량은 비교 대상에서 제외)
+            self._last_throughput = throughput if ready and action in ("+", "=") else None
+            self._last_action = action
+            self._window_started = now
+            self._window_completed = 0
+        return self.workers
+
+    def _decide(self, sample: SystemSample, throughput: float, ready: bool) -> str:
+        # 1) 과부하 판단
+        if sample.mem_available_percent is not None and sample.mem_available_percent < MEM_CRITICAL_PERCENT:
+            return "--" if self.workers > self.min_workers else "="
+        overloaded = (
+            (sample.cpu_percent is not None and sample.cpu_percent > CPU_HIGH_PERCENT)
+            or (sample.mem_available_percent is not None and sample.mem_available_percent < MEM_LOW_PERCENT)
+            or (sample.disk_busy is not None and sample.disk_busy > DISK_BUSY_HIGH)
+        )
+        if overloaded:
+            return "-" if self.workers > self.min_workers else "="
+
+        # 처리량을 판단할 만큼 작업이 끝나지 않았으면 유지
+        if not ready:
+            return "="
+
+        # 2) 직전 증설이 처리량을 떨어뜨렸으면 되돌리고 상한을 낮춤
+        if (
+            self._last_action == "+"
+            and self._last_throughput is not None
+            and throughput < self._last_throughput * THROUGHPUT_DROP_RATIO
+        ):
+            self._ceiling = max(self.min_workers, self.workers - 1)
+            return "-"
+
+        # 3) 여유가 있으면 증설
+        has_headroom = sample.cpu_percent is None or sample.cpu_percent < CPU_LOW_PERCENT
+        if has_headroom and self.workers < self._ceiling:
+            return "+"
+        return "="
+
+    def format_summary(self) -> list[str]:
+        """구간별 동시 실행 수/처리량/시스템 상태를 표 형태의 문자열 목록으로 반환합니다."""
+        def fmt(v: float | None, suffix: str = "") -> str:
+            return "-" if v is None else f"{v:.1f}{suffix}"
+
+        lines = [f"{'경과(s)':>8} {'동시실행':>6} {'처리량(/분)':>10} {'CPU':>7} {'MEM여유':>7} {'DISK':>5}  조정"]
+        for s in self.steps:
+            lines.append(
+                f"{s.elapsed:>8.1f} {s.workers:>6} {s.throughput:>10.1f} "
+                f"{fmt(s.sample.cpu_percent, '%'):>7} {fmt(s.sample.mem_available_percent, '%'):>7} "
+                f"{fmt(s.sample.disk_busy):>5}  {s.action}"
+            )
+        return lines
@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import threading
+
+# 설정 파일과 같은 폴더에 저장되는 기본 이력 파일명
+DEFAULT_HISTORY_FILENAME = ".deploy_history.jsonl"
+
+# 이력도 없고 크기 기반 추정도 불가능할 때 사용하는 기본 소요 시간(초)
+DEFAULT_ESTIMATE_SECONDS = 5.0
+
+# 같은 파일이 여러 번 기록된 경우 최근 값에 주는 가중치 (지수 이동 평균)
+EWMA_ALPHA = 0.5
+
+
+def _history_key(file_path: str) -> str:
+    """이력 조회용 키 (대소문자/구분자 차이를 흡수한 절대 경로)"""
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+def resolve_history_path(config_path: str, history_path: str | None = None) -> str:
+    """
+    배포 이력 파일 경로를 결정합니다.
+    별도로 지정하지 않으면 설정 파일과 같은 폴더의 .deploy_history.jsonl 을 사용합니다.
+
+    Args:
+        config_path (str): 설정 파일 경로
+        history_path (str | None): 사용자가 지정한 이력 파일 경로
+
+    Returns:
+        str: 이력 파일 절대 경로
+    """
+    if history_path:
+        return os.path.abspath(history_path)
+    return os.path.join(os.path.dirname(os.path.abspath(config_path)), DEFAULT_HISTORY_FILENAME)
+
+
+class DeployHistory:
+    """
+    소스 파일별 nexacrodeploy 실행 소요 시간을 JSON-lines 파일에 기록/조회합니다.
+    한 줄에 한 번의 실행 결과({"file", "size", "duration", "ts"})가 저장됩니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.durations: dict[str, float] = {}  # 파일 키 -> 평균 소요 시간(초)
+        self.sizes: dict[str, int] = {}        # 파일 키 -> 마지막 기록 시점의 파일 크기
+        self._lock = threading.Lock()
+        self._model: tuple[float, float] | None = None  # 크기 기반 추정 모델 캐시
+        self._model_dirty = True
+
+    def load(self) -> "DeployHistory":
+        """
+        이력 파일을 읽어 파일별 소요 시간을 복원합니다.
+        손상된 줄은 건너뛰며, 중복 기록이 많이 쌓였으면 파일을 압축(재작성)합니다.
+        """
+        if not os.path.isfile(self.path):
+            return self
+
+        line_count = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                    key = _history_key(rec["file"])
+                    duration = float(rec["duration"])
+                    size = int(rec.get("size", 0))
+                except (ValueError, KeyError, TypeError):
+                    continue
+                line_count += 1
+                self._update(key, size, duration)
+
+        # 파일별 기록이 평균 5건을 넘으면 최신 값만 남기도록 재작성
+        if self.durations and line_count > len(self.durations) * 5:
+            self._compact()
+        return self
+
+    def _update(self, key: str, size: int, duration: float) -> None:
+        prev = self.durations.get(key)
+        if prev is None:
+            self.durations[key] = duration
+        else:
+            self.durations[key] = EWMA_ALPHA * duration + (1 - EWMA_ALPHA) * prev
+        self.sizes[key] = size
+        self._model_dirty = True
+
+    def _compact(self) -> None:
+        tmp_path = self.path + ".tmp"
+        now = time.time()
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for key, duration in self.durations.items():
+                    rec = {"file": key, "size": self.sizes.get(key, 0), "duration": round(duration, 3), "ts": now}
+                    f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            print("배포 이력 파일 정리에 실패했습니다:", exc)
+
+    def record(self, file_path: str, duration: float) -> None:
+        """
+        한 파일의 실행 소요 시간을 메모리와 이력 파일에 기록합니다. (스레드 안전)
+
+        Args:
+            file_path (str): -FILE 로 사용한 소스 파일 경로
+            duration (float): 실행 소요 시간(초)
+        """
+        key = _history_key(file_path)
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = 0
+
+        rec = {"file": key, "size": size, "duration": round(duration, 3), "ts": time.time()}
+        with self._lock:
+            self._update(key, size, duration)
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            except OSError as exc:
+                print("배포 이력 기록에 실패했습니다:", exc)
+
+    def _size_model(self) -> tuple[float, float] | None:
+        """
+        기록된 (파일 크기, 소요 시간) 쌍으로 최소제곱 직선(고정 비용 + 바이트당 비용)을 구합니다.
+
+        Returns:
+            tuple[float, float] | None: (절편(초), 기울기(초/바이트)), 이력이 없으면 None
+        """
+        pairs = [(self.sizes.get(k, 0), d) for k, d in self.durations.items()]
+        if not pairs:
+            return None
+
+        n = len(pairs)
+        mean_x = sum(x for x, _ in pairs) / n
+        mean_y = sum(y for _, y in pairs) / n
+        var_x = sum((x - mean_x) ** 2 for x, _ in pairs)
+        if n < 2 or var_x == 0:
+            # 크기 분산이 없으면 평균 소요 시간을 그대로 사용
+            return mean_y, 0.0
+
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in pairs) / var_x
+        if slope < 0:
+            return mean_y, 0.0
+        return mean_y - slope * mean_x, slope
+
+    def measured(self, file_path: str) -> float | None:
+        """파일을 단독으로 실행해 기록된 평균 소요 시간을 반환합니다. (기록이 없으면 None)"""
+        return self.durations.get(_history_key(file_path))
+
+    def estimate(self, file_path: str) -> float:
+        """
+        파일 한 개의 예상 실행 시간을 반환합니다.
+        이력이 있으면 기록된 평균값을, 없으면 파일 크기 기반 추정값을 사용합니다.
+
+        Args:
+            file_path (str): 소스 파일 경로
+
+        Returns:
+            float: 예상 소요 시간(초)
+        """
+        key = _history_key(file_path)
+        if key in self.durations:
+            return self.durations[key]
+
+        if self._model_dirty:
+            self._model = self._size_model()
+            self._model_dirty = False
+        model = self._model
+        if model is None:
+            return DEFAULT_ESTIMATE_SECONDS
+
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = 0
+        intercept, slope = model
+        return max(intercept + slope * size, 0.1)
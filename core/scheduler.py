@@ -0,0 +1,69 @@
+import heapq
+from dataclasses import dataclass, field
+
+
+@dataclass
+class DeployJob:
+    """nexacrodeploy 1회 실행 단위 (-FILE 한 개, 또는 batch 로 묶인 여러 개)"""
+    file_path: str              # -FILE 로 넘길 소스 파일
+    o_dir: str                  # 결과물(.js)을 옮길 -O 폴더
+    rel_path: str               # Services 에서 추출한 상대 경로 (정규화된 값)
+    cmd: list[str] = field(default_factory=list)  # 실행할 전체 명령어
+    estimate: float = 0.0       # 예상 소요 시간(초)
+    project: str = ""           # 여러 프로젝트를 한 번에 배포할 때의 프로젝트 이름
+    returncode: int | None = None  # 실행 결과 (None: 실행되지 않음)
+    duration: float = 0.0       # 실제 소요 시간(초)
+    batch: list["DeployJob"] = field(default_factory=list)  # 묶음 실행 시 포함된 개별 작업 (비어있으면 단일 실행)
+    retried: list["DeployJob"] = field(default_factory=list)  # 묶음 실패/결과물 누락으로 개별 재실행한 작업
+
+    @property
+    def members(self) -> list["DeployJob"]:
+        """이 실행이 처리하는 개별(-FILE 1개) 작업 목록"""
+        return self.batch or [self]
+
+
+def order_jobs_lpt(jobs: list[DeployJob]) -> list[DeployJob]:
+    """
+    예상 소요 시간이 긴 작업부터 실행하도록 정렬합니다. (LPT: Longest Processing Time first)
+    병렬 실행 시 큰 파일이 마지막에 시작되어 전체 시간이 늘어나는 현상을 줄입니다.
+
+    Args:
+        jobs (list[DeployJob]): 배포 작업 리스트
+
+    Returns:
+        list[DeployJob]: 정렬된 작업 리스트 (예상 시간 내림차순, 같으면 경로순)
+    """
+    return sorted(jobs, key=lambda j: (-j.estimate, j.file_path))
+
+
+def estimate_makespan(estimates: list[float], workers: int) -> float:
+    """
+    주어진 순서대로 작업을 가장 먼저 비는 작업자에게 배정했을 때의 전체 소요 시간을 계산합니다.
+
+    Args:
+        estimates (list[float]): 실행 순서대로 나열된 작업별 예상 시간(초)
+        workers (int): 동시 실행 수
+
+    Returns:
+        float: 예상 전체 소요 시간(초)
+    """
+    if not estimates:
+        return 0.0
+    slots = [0.0] * max(1, min(workers, len(estimates)))
+    for est in estimates:
+        earliest = heapq.heappop(slots)
+        heapq.heappush(slots, earliest + est)
+    return max(slots)
+
+
+def format_duration(seconds: float) -> str:
+    """초 단위 시간을 '1h 02m 03s' / '02m 03s' / '3.2s' 형태의 문자열로 변환합니다."""
+    seconds = max(0.0, seconds)
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    total = int(round(seconds))
+    h, rem = divmod(total, 3600)
+    m, s = divmod(rem, 60)
+    if h:
+        return f"{h}h {m:02d}m {s:02d}s"
+    return f"{m:02d}m {s:02d}s"
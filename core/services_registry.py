@@ -0,0 +1,112 @@
+import os
+from dataclasses import dataclass, field
+from .config_manager import load_base_dir_from_F, load_base_dir_from_O
+from .xml_parser import parse_services_entries
+
+
+@dataclass(frozen=True)
+class ServiceEntry:
+    """<Services> 의 상대 경로 항목 하나 (경로는 생성 시 한 번만 정규화/계산)"""
+    prefixid: str      # <Service prefixid="..."> 값 (없으면 "")
+    url: str           # Services 에 적힌 '../' 상대 경로 원문
+    rel_path: str      # 정규화된 상대 경로 (다른 모듈의 dict 키로 사용)
+    source_path: str   # -F 기준 절대 경로 (배포할 소스 폴더 또는 파일)
+    output_dir: str    # -O 기준 절대 경로 (배포 결과물 폴더)
+    text: str = ""     # 항목 원문 (변경 비교용)
+
+
+@dataclass
+class ServicesRegistry:
+    """
+    typedefinition.xml 의 Services 항목을 상대 경로 기준으로 중복 없이 보관합니다.
+    prefixid / 정규화된 상대 경로로 바로 찾을 수 있도록 색인을 함께 유지합니다.
+    """
+    base_f_dir: str
+    base_o_dir: str
+    entries: list[ServiceEntry] = field(default_factory=list)
+    by_rel_path: dict[str, ServiceEntry] = field(default_factory=dict)
+    by_prefixid: dict[str, ServiceEntry] = field(default_factory=dict)
+
+    def resolve_output_dir(self, rel_path: str) -> str:
+        """상대 경로에 해당하는 -O 기준 절대 경로 (등록되지 않은 경로도 계산 가능)"""
+        entry = self.by_rel_path.get(os.path.normpath(rel_path))
+        if entry is not None:
+            return entry.output_dir
+        return os.path.normpath(os.path.join(self.base_o_dir, rel_path))
+
+    def add(self, prefixid: str, url: str, text: str = "") -> ServiceEntry:
+        """
+        항목을 등록합니다. 같은 상대 경로가 이미 있으면 먼저 등록된 항목을 유지하되,
+        prefixid 는 항상 색인하여 어떤 prefixid 로도 해당 경로를 찾을 수 있게 합니다.
+
+        Returns:
+            ServiceEntry: 등록된(또는 기존) 항목
+        """
+        rel_path = os.path.normpath(url)
+        existing = self.by_rel_path.get(rel_path)
+        if existing is not None:
+            if prefixid and prefixid not in self.by_prefixid:
+                self.by_prefixid[prefixid] = existing
+            return existing
+
+        entry = ServiceEntry(
+            prefixid=prefixid,
+            url=url,
+            rel_path=rel_path,
+            source_path=os.path.normpath(os.path.join(self.base_f_dir, url)),
+            output_dir=os.path.normpath(os.path.join(self.base_o_dir, url)),
+            text=text,
+        )
+        self.entries.append(entry)
+        self.by_rel_path[rel_path] = entry
+        if prefixid and prefixid not in self.by_prefixid:
+            self.by_prefixid[prefixid] = entry
+        return entry
+
+    @property
+    def rel_paths(self) -> list[str]:
+        """등록 순서대로의 정규화된 상대 경로 목록"""
+        return [e.rel_path for e in self.entries]
+
+    def select(self, rel_paths: list[str] | set[str] | None = None) -> list[ServiceEntry]:
+        """지정한 상대 경로의 항목만 등록 순서대로 반환합니다. (None 이면 전체)"""
+        if rel_paths is None:
+            return list(self.entries)
+        wanted = {os.path.normpath(rp) for rp in rel_paths}
+        return [e for e in self.entries if e.rel_path in wanted]
+
+    def output_dirs(self, rel_paths: list[str] | set[str] | None = None) -> dict[str, str]:
+        """상대 경로 -> -O 기준 절대 경로 매핑"""
+        return {e.rel_path: e.output_dir for e in self.select(rel_paths)}
+
+    def snapshot(self) -> dict[str, str]:
+        """상대 경로 -> 항목 원문 (Services 변경 비교/스냅샷 저장용)"""
+        return {e.rel_path: e.text for e in self.entries}
+
+
+def load_services_registry(
+    config: dict,
+    config_path: str,
+    xml_path: str,
+    encoding: str,
+    errors: str,
+    max_hits: int = 0,
+) -> ServicesRegistry:
+    """
+    typedefinition.xml 을 한 번 읽어 Services 레지스트리를 만듭니다.
+
+    Args:
+        config (dict): 설정 데이터
+        config_path (str): 설정 파일 경로
+        xml_path (str): typedefinition.xml 경로
+        encoding (str): 파일 인코딩
+        errors (str): 디코딩 에러 처리 방식
+        max_hits (int): 최대 추출 개수 (0이면 제한 없음)
+
+    Returns:
+        ServicesRegistry: prefixid/url/상대 경로/-F/-O 경로가 계산된 레지스트리
+    """
+    registry = ServicesRegistry(load_base_dir_from_F(config, config_path), load_base_dir_from_O(config, config_path))
+    for prefixid, url, text in parse_services_entries(xml_path, encoding, errors, max_hits):
+        registry.add(prefixid, url, text)
+    return registry
@@ -0,0 +1,112 @@
+import os
+import json
+from dataclasses import dataclass, field
+
+# 설정 파일과 같은 폴더에 저장되는 기본 스냅샷 파일명
+DEFAULT_SNAPSHOT_FILENAME = ".services_snapshot.json"
+
+
+@dataclass
+class ServicesDiff:
+    """직전 배포 시점과 현재 <Services> 항목의 차이 (값은 정규화된 상대 경로)"""
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    baseline: bool = True  # 비교할 이전 스냅샷이 있었는지 여부
+
+    @property
+    def affected(self) -> set[str]:
+        """다시 배포해야 하는 상대 경로 (추가 + 변경)"""
+        return set(self.added) | set(self.changed)
+
+
+def diff_services(previous: dict[str, str] | None, current: dict[str, str]) -> ServicesDiff:
+    """
+    이전 스냅샷과 현재 Services 항목을 비교합니다.
+    이전 스냅샷이 없으면 모든 항목을 추가된 것으로 취급합니다. (전체 배포)
+
+    Args:
+        previous (dict[str, str] | None): 이전 스냅샷 (상대 경로 -> 항목 원문)
+        current (dict[str, str]): 현재 항목 (상대 경로 -> 항목 원문)
+
+    Returns:
+        ServicesDiff: 비교 결과
+    """
+    if previous is None:
+        return ServicesDiff(added=sorted(current), baseline=False)
+
+    diff = ServicesDiff()
+    for rp in sorted(current):
+        if rp not in previous:
+            diff.added.append(rp)
+        elif previous[rp] != current[rp]:
+            diff.changed.append(rp)
+        else:
+            diff.unchanged.append(rp)
+    diff.removed = sorted(rp for rp in previous if rp not in current)
+    return diff
+
+
+def resolve_snapshot_path(config_path: str) -> str:
+    """설정 파일과 같은 폴더의 Services 스냅샷 파일 경로를 반환합니다."""
+    return os.path.join(os.path.dirname(os.path.abspath(config_path)), DEFAULT_SNAPSHOT_FILENAME)
+
+
+class ServicesSnapshot:
+    """
+    프로젝트별로 마지막으로 배포에 성공한 <Services> 항목을 JSON 파일에 보관합니다.
+    형식: {"projects": {"<프로젝트 이름>": {"<상대 경로>": "<항목 원문>", ...}}}
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.projects: dict[str, dict[str, str]] = {}
+
+    def load(self) -> "ServicesSnapshot":
+        if not os.path.isfile(self.path):
+            return self
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as exc:
+            print("Services 스냅샷을 읽지 못해 무시합니다:", exc)
+            return self
+
+        projects = data.get("projects") if isinstance(data, dict) else None
+        if isinstance(projects, dict):
+            self.projects = {
+                name: dict(entries) for name, entries in projects.items() if isinstance(entries, dict)
+            }
+        return self
+
+    def get(self, project: str) -> dict[str, str] | None:
+        """프로젝트의 이전 스냅샷을 반환합니다. (없으면 None)"""
+        return self.projects.get(project)
+
+    def update(self, project: str, entries: dict[str, str]) -> None:
+        """프로젝트의 스냅샷을 현재 항목으로 교체합니다. (save 호출 시 파일에 반영)"""
+        self.projects[project] = dict(entries)
+
+    def save(self) -> None:
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"projects": self.projects}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            print("Services 스냅샷 저장에 실패했습니다:", exc)
+
+
+def print_services_diff(project: str, diff: ServicesDiff) -> None:
+    """Services 비교 결과를 출력합니다. (여러 프로젝트를 동시에 스캔하므로 한 번에 출력)"""
+    if not diff.baseline:
+        print(f"[{project}] 이전 Services 스냅샷이 없어 전체 경로({len(diff.added)}개)를 배포합니다.")
+        return
+    lines = [
+        f"[{project}] Services 변경: 추가 {len(diff.added)}, 변경 {len(diff.changed)}, "
+        f"삭제 {len(diff.removed)}, 유지 {len(diff.unchanged)}"
+    ]
+    for label, paths in (("+", diff.added), ("*", diff.changed), ("-", diff.removed)):
+        lines.extend(f"  {label} {rp}" for rp in paths)
+    print("\n".join(lines))
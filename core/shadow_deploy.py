@@ -0,0 +1,291 @@
+import os
+import json
+import shutil
+from .scheduler import DeployJob
+
+# 배포 결과를 미리 만들어 두는 그림자 폴더, 교체 전 버전을 보관하는 폴더의 접미사 (-O 폴더와 같은 위치)
+SHADOW_SUFFIX = ".__shadow__"
+BACKUP_SUFFIX = ".__prev__"
+ROLLBACK_TMP_SUFFIX = ".__rollback__"
+
+# 설정 파일과 같은 폴더에 저장되는, 교체한 -O 폴더 기록 파일명 (--rollback 대상)
+DEFAULT_RECORD_FILENAME = ".shadow_roots.json"
+
+
+def resolve_shadow_record_path(config_path: str) -> str:
+    """설정 파일과 같은 폴더의 교체 기록 파일 경로를 반환합니다."""
+    return os.path.join(os.path.dirname(os.path.abspath(config_path)), DEFAULT_RECORD_FILENAME)
+
+
+class ShadowRecord:
+    """
+    --shadow 배포로 교체한 최상위 -O 폴더 목록을 JSON 파일에 보관합니다.
+    --rollback 은 Services 를 다시 계산하지 않고 이 목록의 폴더만 되돌립니다.
+    (배포 시 그림자 폴더를 만든 폴더와 되돌리는 폴더가 항상 같도록 하기 위함)
+    경로는 절대 경로로 저장하여 다른 작업 폴더에서 실행해도 같은 폴더를 가리킵니다.
+    형식: {"roots": ["<최상위 -O 폴더>", ...]}
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.roots: list[str] = []
+
+    def load(self) -> "ShadowRecord":
+        if not os.path.isfile(self.path):
+            return self
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as exc:
+            print("교체 기록 파일을 읽지 못해 무시합니다:", exc)
+            return self
+
+        roots = data.get("roots") if isinstance(data, dict) else None
+        if isinstance(roots, list):
+            self.roots = [r for r in roots if isinstance(r, str)]
+        return self
+
+    def replace(self, roots: list[str]) -> None:
+        """
+        기록을 이번 실행에서 교체한 폴더(절대 경로)로 바꿉니다. (save 호출 시 파일에 반영)
+        이전 실행에서만 교체한 폴더는 되돌리면 더 오래된 버전이 되므로 기록에서 뺍니다.
+        교체한 폴더가 없으면 기존 기록을 유지합니다.
+        """
+        if roots:
+            self.roots = [os.path.abspath(r) for r in roots]
+
+    def save(self) -> None:
+        # 폴더와 이전 버전이 모두 없어진 항목은 정리
+        self.roots = [r for r in self.roots if os.path.isdir(r) or os.path.isdir(r + BACKUP_SUFFIX)]
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"roots": self.roots}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            print("교체 기록 저장에 실패했습니다:", exc)
+
+
+def _is_under(path: str, root: str) -> bool:
+    path_c = os.path.normcase(os.path.abspath(path))
+    root_c = os.path.normcase(os.path.abspath(root))
+    return path_c == root_c or path_c.startswith(root_c.rstrip(os.sep) + os.sep)
+
+
+def find_root_dirs(o_dirs: list[str] | set[str]) -> list[str]:
+    """
+    -O 폴더 목록에서 다른 폴더 안에 포함되지 않는 최상위 폴더만 반환합니다.
+    (중첩된 폴더는 상위 폴더를 교체할 때 함께 교체됨)
+    """
+    roots: list[str] = []
+    for o_dir in sorted({os.path.normpath(d) for d in o_dirs}, key=len):
+        if not any(_is_under(o_dir, r) for r in roots):
+            roots.append(o_dir)
+    return roots
+
+
+def prepare_shadow_dirs(o_dirs: list[str] | set[str]) -> dict[str, str]:
+    """
+    최상위 -O 폴더마다 같은 위치에 그림자 폴더를 만들고 현재 배포본을 복사해 둡니다.
+    (일부 파일만 배포해도 교체 후 나머지 파일이 그대로 남도록 하기 위함)
+
+    Args:
+        o_dirs (list[str] | set[str]): 배포 대상 -O 폴더 목록
+
+    Returns:
+        dict[str, str]: 최상위 -O 폴더 -> 그림자 폴더
+
+    Raises:
+        OSError: 그림자 폴더 생성 실패 (그때까지 만든 그림자 폴더는 삭제한 뒤 발생)
+    """
+    shadows: dict[str, str] = {}
+    for root in find_root_dirs(o_dirs):
+        shadow = root + SHADOW_SUFFIX
+        try:
+            # 이전 실행에서 남은 그림자 폴더는 버림
+            if os.path.isdir(shadow):
+                shutil.rmtree(shadow)
+            if os.path.isdir(root):
+                shutil.copytree(root, shadow)
+            else:
+                os.makedirs(shadow)
+        except OSError:
+            for created in [*shadows.values(), shadow]:
+                _discard_shadow_quietly(created)
+            raise
+        shadows[root] = shadow
+    return shadows
+
+
+def to_shadow_path(o_dir: str, shadows: dict[str, str]) -> str:
+    """-O 폴더 경로를 해당 최상위 폴더의 그림자 폴더 안의 경로로 변환합니다."""
+    o_dir = os.path.normpath(o_dir)
+    for root, shadow in shadows.items():
+        if _is_under(o_dir, root):
+            return os.path.normpath(os.path.join(shadow, os.path.relpath(o_dir, root)))
+    return o_dir
+
+
+def redirect_jobs_to_shadow(jobs: list[DeployJob], shadows: dict[str, str]) -> None:
+    """작업의 -O 인자와 .js 이동 대상 폴더를 그림자 폴더로 바꿉니다."""
+    for job in jobs:
+        shadow_o = to_shadow_path(job.o_dir, shadows)
+        for i in range(len(job.cmd) - 1):
+            if job.cmd[i] == "-O":
+                job.cmd[i + 1] = shadow_o
+        job.o_dir = shadow_o
+
+
+def remove_backup_dir(root: str) -> None:
+    """직전 교체 때 보관한 이전 버전(BACKUP_SUFFIX) 폴더를 삭제합니다. (교체 전 점검 단계)"""
+    backup = root + BACKUP_SUFFIX
+    if os.path.isdir(backup):
+        shutil.rmtree(backup)
+
+
+def swap_in_shadow_dir(root: str, shadow: str) -> bool:
+    """
+    그림자 폴더를 실제 -O 폴더로 교체합니다. 기존 폴더는 BACKUP_SUFFIX 폴더로 보관합니다.
+    폴더 교체는 이름 변경 두 번으로 끝나므로 서비스 중인 폴더가 비어있는 시간은 매우 짧습니다.
+    (삭제된 경로 정리로 그림자 폴더가 비어 삭제되었으면 기존 폴더만 보관하여 -O 폴더도 없어짐)
+    두 번째 이름 변경이 실패하면 보관한 기존 폴더를 원래 이름으로 되돌린 뒤 예외를 다시 발생시킵니다.
+
+    Returns:
+        bool: 기존 폴더를 이전 버전으로 보관했으면 True (처음 배포하는 폴더면 False)
+
+    Raises:
+        OSError: 폴더 이름 변경 실패 (Windows 에서 Tomcat 등이 파일을 열고 있는 경우 등)
+    """
+    remove_backup_dir(root)
+    backup = root + BACKUP_SUFFIX
+    kept = os.path.isdir(root)
+    if kept:
+        os.rename(root, backup)
+    if os.path.isdir(shadow):
+        try:
+            os.rename(shadow, root)
+        except OSError:
+            if kept:
+                os.rename(backup, root)
+            raise
+    return kept
+
+
+def discard_shadow_dir(shadow: str) -> None:
+    """배포에 실패한 그림자 폴더를 삭제합니다. (실제 -O 폴더는 건드리지 않음)"""
+    if os.path.isdir(shadow):
+        shutil.rmtree(shadow)
+
+
+def rollback_output_dir(o_dir: str) -> bool:
+    """
+    -O 폴더를 직전 교체 전 버전(BACKUP_SUFFIX)으로 되돌립니다.
+    되돌린 버전은 다시 BACKUP_SUFFIX 로 보관되므로 한 번 더 실행하면 원래대로 돌아옵니다.
+
+    Args:
+        o_dir (str): 되돌릴 -O 폴더
+
+    Returns:
+        bool: 되돌렸으면 True, 보관된 이전 버전이 없으면 False
+
+    Raises:
+        OSError: 폴더 이름 변경 실패 (이전 버전으로 바꾸지 못하면 현재 폴더를 원래 이름으로 되돌린 뒤 발생)
+    """
+    backup = o_dir + BACKUP_SUFFIX
+    if not os.path.isdir(backup):
+        return False
+
+    tmp = o_dir + ROLLBACK_TMP_SUFFIX
+    if os.path.isdir(tmp):
+        shutil.rmtree(tmp)
+    moved = os.path.isdir(o_dir)
+    if moved:
+        os.rename(o_dir, tmp)
+    try:
+        os.rename(backup, o_dir)
+    except OSError:
+        # 서비스 중인 폴더가 없어지지 않도록 원래 이름으로 되돌림
+        if moved:
+            os.rename(tmp, o_dir)
+        raise
+    if os.path.isdir(tmp):
+        os.rename(tmp, backup)
+    return True
+
+
+def _discard_shadow_quietly(shadow: str) -> None:
+    try:
+        discard_shadow_dir(shadow)
+    except OSError as exc:
+        print(f"[SHADOW] 그림자 폴더를 삭제하지 못했습니다: {shadow} ({exc})")
+
+
+def finish_shadow_dirs(
+    shadows: dict[str, str],
+    jobs: list[DeployJob],
+    removed_dirs: dict[str, dict[str, str]] | None = None,
+) -> tuple[list[str], set[str]]:
+    """
+    배포가 끝난 뒤 그림자 폴더를 교체하거나 버립니다.
+    해당 폴더에 배포한 프로젝트의 작업이 모두 성공했을 때만 교체하고, 하나라도 실패/미실행이면
+    그림자 폴더를 삭제하여 서비스 중인 -O 폴더를 그대로 유지합니다.
+    교체 전에 모든 교체 대상의 이전 버전 폴더를 먼저 정리해 보고, 하나라도 실패하면 아무 폴더도 교체하지 않습니다.
+    (서비스 중인 폴더는 그대로이며, 이미 정리된 다른 폴더의 이전 버전은 복구되지 않음)
+    교체 중 실패한 폴더는 서비스 중인 폴더를 유지하고 나머지 폴더의 교체는 계속합니다.
+
+    Args:
+        shadows (dict[str, str]): 최상위 -O 폴더 -> 그림자 폴더
+        jobs (list[DeployJob]): 실행한 (개별) 작업 리스트 (o_dir 은 그림자 경로)
+        removed_dirs (dict[str, dict[str, str]] | None): 프로젝트 이름 -> (삭제된 상대 경로 -> 정리한 -O 폴더)
+
+    Returns:
+        tuple[list[str], set[str]]: (교체한 최상위 -O 폴더 목록, 교체에 실패한 폴더에 배포한 프로젝트 이름)
+    """
+    failed_projects = {j.project for j in jobs if j.returncode != 0}
+    to_swap: dict[str, set[str]] = {}  # 교체할 최상위 -O 폴더 -> 배포한 프로젝트
+    for root, shadow in shadows.items():
+        projects = {j.project for j in jobs if _is_under(j.o_dir, shadow)}
+        projects |= {
+            name for name, dirs in (removed_dirs or {}).items()
+            if any(_is_under(o_dir, root) for o_dir in dirs.values())
+        }
+        if projects and not (projects & failed_projects):
+            to_swap[root] = projects
+        else:
+            _discard_shadow_quietly(shadow)
+            print(f"[SHADOW] 배포 실패로 교체하지 않음: {root}")
+
+    # 교체 전 점검: 이전 버전 폴더를 지울 수 없으면 (파일 잠김 등) 일부만 교체되지 않도록 전체 중단
+    blocked: list[str] = []
+    for root in to_swap:
+        try:
+            remove_backup_dir(root)
+        except OSError as exc:
+            print(f"[SHADOW] 이전 버전 폴더를 삭제하지 못했습니다: {root + BACKUP_SUFFIX} ({exc})")
+            blocked.append(root)
+    if blocked:
+        for root in to_swap:
+            _discard_shadow_quietly(shadows[root])
+            print(f"[SHADOW] 교체하지 않음 (서비스 중인 폴더 유지): {root}")
+        return [], {name for projects in to_swap.values() for name in projects}
+
+    swapped: list[str] = []
+    swap_failed: set[str] = set()
+    for root, projects in to_swap.items():
+        shadow = shadows[root]
+        try:
+            kept = swap_in_shadow_dir(root, shadow)
+        except OSError as exc:
+            if os.path.isdir(root) or not os.path.isdir(root + BACKUP_SUFFIX):
+                print(f"[SHADOW] 교체 실패 (서비스 중인 폴더 유지): {root} ({exc})")
+            else:
+                print(f"[SHADOW] 교체 실패, 기존 폴더를 복구하지 못했습니다: {root} ({exc}) - --rollback 으로 복구하세요.")
+            _discard_shadow_quietly(shadow)
+            swap_failed |= projects
+            continue
+        swapped.append(root)
+        if kept:
+            print(f"[SHADOW] 교체 완료: {root} (이전 버전: {root + BACKUP_SUFFIX})")
+        else:
+            print(f"[SHADOW] 교체 완료: {root}")
+    return swapped, swap_failed
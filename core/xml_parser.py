@@ -74,3 +74,63 @@ def search_rel_paths_in_services_block(
 
     # 하나라도 발견되면 exit_code 0, 아니면 1
     return (0 if hits > 0 else 1), rel_paths
+
+def parse_services_entries(
+    file_path: str,
+    encoding: str,
+    errors: str,
+    max_hits: int = 0,
+) -> list[tuple[str, str, str]]:
+    """
+    <Services> 블록에서 '../' 상대 경로를 포함한 항목을 (prefixid, url, 항목 원문) 형태로 추출합니다.
+    search_rel_paths_in_services_block 과 같은 기준으로 경로 토큰을 찾되, 토큰이 속한
+    <Service .../> 태그의 prefixid 속성과 원문(공백 정리)을 함께 돌려줍니다.
+    태그가 여러 줄에 걸쳐 있으면 태그가 닫힐 때까지 이어 붙여 하나의 항목으로 처리합니다.
+
+    Args:
+        file_path (str): typedefinition.xml 파일 경로
+        encoding (str): 파일 인코딩
+        errors (str): 디코딩 에러 처리 방식
+        max_hits (int): 최대 추출 개수 (0이면 제한 없음, 중복 토큰도 1개로 셈)
+
+    Returns:
+        list[tuple[str, str, str]]: (prefixid(없으면 ""), '../' 상대 경로 토큰, 항목 원문) 리스트
+    """
+    entries: list[tuple[str, str, str]] = []
+    if not os.path.isfile(file_path):
+        return entries
+
+    rel_path_pattern = re.compile(r"\.\./[^\"'\s<>]+")
+    service_tag = re.compile(r"<\s*Service\b[^>]*>", re.IGNORECASE)
+    prefixid_attr = re.compile(r"\bprefixid\s*=\s*[\"']([^\"']*)[\"']", re.IGNORECASE)
+    open_services = re.compile(r"<\s*Services\b", re.IGNORECASE)
+    close_services = re.compile(r"</\s*Services\s*>", re.IGNORECASE)
+
+    unclosed_tag = re.compile(r"<\s*Service\b[^>]*$", re.IGNORECASE)  # 다음 줄로 이어지는 <Service 태그
+
+    in_services = False
+    buf = ""  # 여러 줄에 걸친 <Service ...> 태그를 모으는 버퍼
+    with open(file_path, "r", encoding=encoding, errors=errors) as f:
+        for line in f:
+            if not in_services and open_services.search(line):
+                in_services = True
+
+            if in_services:
+                buf += line
+                closing = close_services.search(line)
+                # 태그가 아직 닫히지 않았으면 다음 줄과 합쳐서 처리 (prefixid 와 url 이 다른 줄에 있을 수 있음)
+                if closing or not unclosed_tag.search(buf):
+                    # 한 줄에 태그가 여러 개일 수 있으므로 태그 단위로 처리, 태그가 없으면 버퍼 전체 사용
+                    for chunk in service_tag.findall(buf) or [buf]:
+                        pid = prefixid_attr.search(chunk)
+                        text = " ".join(chunk.split())
+                        for m in rel_path_pattern.findall(chunk):
+                            entries.append((pid.group(1) if pid else "", m, text))
+                            if max_hits > 0 and len(entries) >= max_hits:
+                                return entries
+                    buf = ""
+
+                if closing:
+                    in_services = False
+
+    return entries
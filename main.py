@@ -1,10 +1,38 @@
 import argparse
 import sys
 import os
-from core.config_manager import load_config, load_base_dir_from_F
+from concurrent.futures import ThreadPoolExecutor
+from core.config_manager import load_config, load_base_dir_from_F, load_project_configs
 from core.xml_parser import search_rel_paths_in_services_block
-from core.file_utils import compute_effective_O_values, collect_files_for_FILE_from_F
-from core.deploy_manager import run_nexacro_deploy_repeat
+from core.file_utils import collect_source_files
+from core.services_registry import ServicesRegistry, load_services_registry
+from core.deploy_manager import (
+    build_deploy_base_command,
+    build_deploy_jobs,
+    get_batch_file_arg_style,
+    run_deploy_jobs,
+)
+from core.history_store import DeployHistory, resolve_history_path
+from core.governor import ConcurrencyGovernor
+from core.shadow_deploy import ShadowRecord, resolve_shadow_record_path, rollback_output_dir
+from core.services_snapshot import ServicesSnapshot, resolve_snapshot_path, diff_services, print_services_diff
+
+# 여러 프로젝트의 typedefinition.xml 을 동시에 스캔할 때의 최대 스레드 수
+SCAN_WORKERS = 8
+
+def parse_jobs(value: str) -> int:
+    """
+    --jobs 값을 해석합니다. 'auto' 는 0 으로 변환되어 시스템 부하 기반 자동 조정을 의미합니다.
+    """
+    if value.strip().lower() == "auto":
+        return 0
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"정수 또는 'auto' 를 입력하세요: {value}")
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"1 이상의 값을 입력하세요: {value}")
+    return n
 
 def parse_args():
     """
@@ -27,51 +55,214 @@ def parse_args():
     p.add_argument("--errors", default="ignore", choices=["ignore", "replace", "strict"],help="인코딩 에러 처리 방식 (기본값: ignore)")
     p.add_argument("--no-line-number", action="store_true", help="출력 시 줄번호 생략")
 
-    return p.parse_args()
+    p.add_argument("-j", "--jobs", type=parse_jobs, default=1, help="동시에 실행할 배포 프로세스 수 (기본값: 1, 순차 실행 / auto: 시스템 부하에 따라 자동 조정)")
+    p.add_argument("--max-jobs", type=int, default=0, help="--jobs auto 일 때 최대 동시 실행 수 (0이면 CPU 코어 수)")
+    p.add_argument("--list-services", action="store_true", help="Services 항목을 prefixid,url,-F 경로,-O 경로 형식으로 출력하고 종료 (배포하지 않음)")
+    p.add_argument("--services-diff", action="store_true", help="직전 배포 이후 Services 에 추가/변경된 상대 경로만 배포")
+    p.add_argument("--clean-removed", action="store_true", help="--services-diff 시 Services 에서 삭제된 경로의 배포 결과(.js)를 -O 폴더에서 삭제")
+    p.add_argument("--batch-size", type=int, default=0, help="같은 -O 폴더의 파일을 한 번의 nexacrodeploy 실행으로 묶을 최대 개수 (0이면 파일마다 실행)")
+    p.add_argument("--shadow", action="store_true", help="-O 폴더 옆의 그림자 폴더에 배포한 뒤 성공 시 폴더째 교체 (이전 버전은 .__prev__ 로 보관)")
+    p.add_argument("--rollback", action="store_true", help="--shadow 로 교체된 -O 폴더를 이전 버전으로 되돌리고 종료")
+    p.add_argument("--history", default=None, help="파일별 배포 소요 시간 이력 파일 경로 (기본값: config.json 폴더의 .deploy_history.jsonl)")
 
-def main():
+    args = p.parse_args()
+    if args.clean_removed and not args.services_diff:
+        p.error("--clean-removed 는 --services-diff 와 함께 사용해야 합니다.")
+    return args
+
+def print_services_registry(name: str, registry: ServicesRegistry) -> None:
     """
-    메인 실행 함수. 전반적인 로직 흐름을 제어합니다.
-    1. 설정 로드
-    2. XML 파싱 (경로 토큰 수집)
-    3. 배포 경로 및 대상 파일 계산
-    4. 배포 명령 실행 (run-deploy 옵션 시)
+    Services 레지스트리 내용을 prefixid,url,-F 경로,-O 경로 형식(CSV)으로 출력합니다.
+    같은 경로를 가리키는 다른 prefixid 도 prefixid 색인에서 찾아 한 줄씩 출력합니다.
     """
-    args = parse_args()
-    config = load_config(args.config_path)
+    lines = [f"[{name}] prefixid,url,source,output"]
+    for entry in registry.entries:
+        lines.append(f"{entry.prefixid},{entry.url},{entry.source_path},{entry.output_dir}")
+        lines.extend(
+            f"{pid},{entry.url},{entry.source_path},{entry.output_dir}"
+            for pid, e in registry.by_prefixid.items() if e is entry and pid != entry.prefixid
+        )
+    print("\n".join(lines))
+
+def rollback_outputs(record: ShadowRecord) -> int:
+    """
+    --shadow 배포로 교체된 -O 폴더들(교체 기록 파일)을 보관된 이전 버전으로 되돌립니다.
 
+    Returns:
+        int: 종료 코드 (0: 하나 이상 되돌림, 1: 되돌릴 이전 버전 없음 또는 실패)
+    """
+    restored = 0
+    failed = 0
+    for root in record.roots:
+        try:
+            if rollback_output_dir(root):
+                print("[ROLLBACK] 이전 버전으로 되돌림:", root)
+                restored += 1
+        except OSError as exc:
+            print(f"[ROLLBACK] 되돌리기에 실패했습니다: {root} ({exc})")
+            failed += 1
+    if not restored and not failed:
+        print("되돌릴 이전 버전(.__prev__)이 없습니다.")
+    return 0 if restored and not failed else 1
+
+def scan_project(
+    name: str,
+    config: dict,
+    config_path: str,
+    args,
+    snapshots: ServicesSnapshot,
+) -> tuple[int, dict[str, str], dict[str, list[str]], dict[str, str], dict[str, str]]:
+    """
+    프로젝트 하나의 typedefinition.xml 을 읽어 배포 대상(-O 폴더, -FILE 목록)을 계산합니다.
+    --services-diff 옵션이면 직전 배포 스냅샷과 비교하여 추가/변경된 상대 경로만 대상으로 남깁니다.
+    (스캔 단계에서는 파일을 변경하지 않으며, --clean-removed 정리는 배포 성공 후에 수행)
+
+    Args:
+        name (str): 프로젝트 이름 (스냅샷 구분용)
+        config (dict): 프로젝트 단위 설정 데이터
+        config_path (str): 설정 파일 경로
+        args (Namespace): 커맨드 라인 인자
+        snapshots (ServicesSnapshot): 직전 배포 시점의 Services 스냅샷
+
+    Returns:
+        tuple[int, dict[str, str], dict[str, list[str]], dict[str, str], dict[str, str]]:
+            (검색 종료 코드(0:발견, 1:미발견, 2:파일 없음), 상대 경로 -> -O 폴더,
+             상대 경로 -> 소스 파일 리스트, 현재 Services 항목(배포 성공 시 스냅샷으로 저장),
+             Services 에서 삭제되어 정리할 상대 경로 -> -O 폴더)
+    """
     # typedefinition.xml 위치는 -F 설정값 기준으로 파악 (기존 로직 유지)
-    base_dir = load_base_dir_from_F(config, args.config_path)
+    base_dir = load_base_dir_from_F(config, config_path)
     xml_path = os.path.join(base_dir, "typedefinition.xml")
-    
+
     if not os.path.isfile(xml_path):
         print("typedefinition.xml 파일을 찾을 수 없습니다:", xml_path)
-        sys.exit(2)
-
-    # 1) Typedefinition.xml의 <Services> 구간에서 ../ 로 시작하는 상대 경로 패턴 수집
-    exit_code, rel_paths = search_rel_paths_in_services_block(
-        file_path=xml_path,
-        encoding=args.encoding,
-        errors=args.errors,
-        contains_only=args.contains_only,
-        max_hits=args.max_hits,
-    )
+        return 2, {}, {}, {}, {}
 
-    # --contains-only 옵션이 켜져있으면 단순히 발견 여부만 체크하고 종료
+    # --contains-only 옵션이 켜져있으면 발견 여부만 필요 (기존 검색 함수 사용)
     if args.contains_only:
-        sys.exit(exit_code)
+        exit_code, _ = search_rel_paths_in_services_block(
+            file_path=xml_path,
+            encoding=args.encoding,
+            errors=args.errors,
+            contains_only=True,
+            max_hits=args.max_hits,
+        )
+        return exit_code, {}, {}, {}, {}
+
+    # 1) Typedefinition.xml의 <Services> 구간을 한 번 읽어 prefixid/url/-F/-O 경로가 계산된 레지스트리 생성
+    registry = load_services_registry(config, config_path, xml_path, args.encoding, args.errors, args.max_hits)
+    exit_code = 0 if registry.entries else 1
+    services = registry.snapshot()
+
+    if args.list_services:
+        print_services_registry(name, registry)
+        return exit_code, {}, {}, {}, {}
+
+    rel_paths = registry.rel_paths
+    removed_dirs: dict[str, str] = {}
+    if args.services_diff:
+        # 직전 배포 대비 추가/변경된 상대 경로만 배포
+        diff = diff_services(snapshots.get(name), services)
+        print_services_diff(name, diff)
+        affected = diff.affected
+        rel_paths = [rp for rp in rel_paths if rp in affected]
+
+        if args.clean_removed:
+            removed_dirs = {rp: registry.resolve_output_dir(rp) for rp in diff.removed}
+
+    # 2) 레지스트리에서 실제 배포 대상 폴더(-O) 매핑 조회
+    effective_o_map = registry.output_dirs(rel_paths)
 
-    # 2) -O 옵션 값과 수집된 토큰을 결합하여 실제 배포 대상 폴더 리스트 생성
-    effective_o_map = compute_effective_O_values(config, args.config_path, rel_paths)
+    # 3) -F 기준 경로에서 실제 배포할 파일(.xfdl, .xjs) 리스트 생성
+    file_paths_by_rel = collect_source_files(registry.select(rel_paths))
 
-    # 3) -F 기준 폴더와 상대 경로를 결합하여 실제 배포할 파일(.xfdl, .xjs) 리스트 생성
-    file_paths_by_rel = collect_files_for_FILE_from_F(config, args.config_path, rel_paths)
+    return exit_code, effective_o_map, file_paths_by_rel, services, removed_dirs
 
-    # 4) 배포 실행 (옵션 여부와 상관없이 실행하는 기존 로직 유지)
+def main():
+    """
+    메인 실행 함수. 전반적인 로직 흐름을 제어합니다.
+    1. 설정 로드 (config.json 의 "projects" 가 있으면 프로젝트별로 펼침)
+    2. XML 파싱 (경로 토큰 수집) - 여러 프로젝트는 동시에 스캔
+    3. 배포 경로 및 대상 파일 계산 (--services-diff 시 변경된 경로만)
+    4. 배포 명령 실행 - 프로젝트 수와 관계없이 모든 작업을 하나의 실행 큐로 처리
+    5. 배포에 성공한 프로젝트의 Services 스냅샷 저장
+    """
+    args = parse_args()
+    config = load_config(args.config_path)
+    projects = load_project_configs(config)
+    shadow_record = ShadowRecord(resolve_shadow_record_path(args.config_path)).load()
+    if args.rollback:
+        # 배포 때 실제로 교체한 폴더만 되돌림 (Services 를 다시 계산하지 않음)
+        sys.exit(rollback_outputs(shadow_record))
+
+    snapshots = ServicesSnapshot(resolve_snapshot_path(args.config_path)).load()
+
+    # 파일별 소요 시간 이력을 읽어 실행 순서(LPT)와 예상 시간 계산에 사용
+    history = DeployHistory(resolve_history_path(args.config_path, args.history)).load()
+    # --jobs auto: 1개로 시작해 CPU/메모리/디스크 부하와 처리량을 보며 동시 실행 수를 조정
+    governor = ConcurrencyGovernor(max_workers=args.max_jobs or None) if args.jobs == 0 else None
+
+    # typedefinition.xml 스캔 (여러 프로젝트는 동시에 수행)
+    if len(projects) == 1:
+        results = [scan_project(projects[0][0], projects[0][1], args.config_path, args, snapshots)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(projects), SCAN_WORKERS)) as executor:
+            results = list(executor.map(
+                lambda p: scan_project(p[0], p[1], args.config_path, args, snapshots), projects
+            ))
+
+    exit_code = max(r[0] for r in results)
+    if args.contains_only or args.list_services or all(r[0] == 2 for r in results):
+        sys.exit(exit_code)
+
+    # 4) 모든 프로젝트의 작업을 하나의 실행 큐로 합침
     # --run-deploy 플래그는 argparse에 있지만, 기존 로직상 호출을 막지 않았음 (필요 시 if args.run_deploy: 추가 가능)
-    run_nexacro_deploy_repeat(config, args.config_path, effective_o_map, file_paths_by_rel)
+    deploy_jobs = []
+    up_to_date: list[str] = []  # 배포할 변경이 없어 바로 스냅샷을 갱신할 프로젝트
+    file_arg_styles: dict[str, str] = {}
+    for (name, project_config), (code, effective_o_map, file_paths_by_rel, _, _) in zip(projects, results):
+        if code == 2:
+            continue
+        if args.services_diff and not effective_o_map:
+            print(f"[{name}] Services 변경 사항이 없어 배포를 건너뜁니다.")
+            up_to_date.append(name)
+            continue
+        if not effective_o_map:
+            print(f"[{name}] 실행할 -O 대상이 없습니다. (Services에서 상대경로 토큰을 찾지 못함)")
+            continue
+        if not file_paths_by_rel:
+            print(f"[{name}] 실행할 -FILE 대상 파일이 없습니다. (-F 기준 폴더에서 .xfdl/.xjs 파일을 찾지 못함)")
+            continue
+        base_cmd, rule_val = build_deploy_base_command(project_config, args.config_path)
+        project_jobs = build_deploy_jobs(base_cmd, rule_val, effective_o_map, file_paths_by_rel, project=name)
+        file_arg_styles[name] = get_batch_file_arg_style(project_config)
+        print(f"[{name}] 배포 대상 파일 {len(project_jobs)}개")
+        deploy_jobs.extend(project_jobs)
+
+    # --clean-removed: 삭제된 경로는 배포가 성공한 뒤에 정리 (--shadow 면 그림자 폴더 안에서)
+    # 배포 대상이 없어 건너뛴 프로젝트는 스냅샷도 갱신하지 않으므로 정리하지 않음
+    deployed = set(up_to_date) | {j.project for j in deploy_jobs}
+    removed_dirs = {name: r[4] for (name, _), r in zip(projects, results) if r[4] and name in deployed}
+
+    deploy_code = 0
+    unswapped: set[str] = set()  # --shadow 폴더 교체에 실패한 프로젝트 (스냅샷 갱신 제외)
+    if deploy_jobs or removed_dirs:
+        deploy_code = run_deploy_jobs(
+            deploy_jobs, max(1, args.jobs), history, governor,
+            args.batch_size, file_arg_styles, shadow_record if args.shadow else None, removed_dirs, unswapped,
+        )
+    if not deploy_jobs and not up_to_date:
+        print("실행할 배포 대상이 없습니다.")
+        sys.exit(1)
+
+    # 5) 모든 작업이 성공한 프로젝트만 스냅샷 갱신
+    services_by_name = {name: r[3] for (name, _), r in zip(projects, results)}
+    for name in up_to_date + sorted({j.project for j in deploy_jobs}):
+        if name not in unswapped and all(j.returncode == 0 for j in deploy_jobs if j.project == name):
+            snapshots.update(name, services_by_name[name])
+    snapshots.save()
 
-    sys.exit(exit_code)
+    sys.exit(deploy_code or exit_code)
 
 if __name__ == "__main__":
     main()